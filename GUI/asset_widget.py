@@ -6,31 +6,45 @@ from PySide6.QtWidgets import (
     QLabel,
     QPushButton,
     QMessageBox,
+    QSpinBox,
     QStyle,
 )
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import Signal
 
 from GUI.gui_utilities import truncate_string
-from GUI.worker import Worker
 from GUI.shared_data import install_asset_list, remove_asset_list
 from helper import file_operations
-from content_database import delete_archive
-from installer import start_installer_gui
+from install_scheduler import InstallJob, scheduler
 
 
 class AssetWidget(QFrame):
     """Custom widget to represent an asset in the UI."""
 
     installation_finished = Signal(int)
+    installation_cancelled = Signal()
     warning_signal = Signal(str, str)
 
     def __init__(
-        self, parent, tab_name: str, asset_name: str = "", file_path: str = ""
+        self,
+        parent,
+        tab_name: str,
+        asset_name: str = "",
+        file_path: str = "",
+        file_size: int | None = None,
+        executor=None,
     ):
         super().__init__(parent)
         self.asset_name = asset_name
         self.file_path = file_path
-        self.file_size = file_operations.get_file_size(self.file_path)
+        self.file_size_bytes = file_size
+        self.executor = executor
+        self.job = None
+        # Set when the asset was removed while its install was still running
+        self.is_removed = False
+        if file_size is None:
+            self.file_size = file_operations.get_file_size(self.file_path)
+        else:
+            self.file_size = file_operations.convert_size(file_size)
         self.tab_name = tab_name
         self.setFrameShape(QFrame.Shape.StyledPanel)
         self.setLineWidth(1)
@@ -49,6 +63,9 @@ class AssetWidget(QFrame):
         self.warning_signal.connect(self.show_warning_message)
 
     def show_warning_message(self, title, message):
+        if self.is_removed:
+            self.delete_widget()
+            return
         msg_box = QMessageBox(self)
         msg_box.setIcon(QMessageBox.Icon.Warning)
         msg_box.setWindowTitle(title)
@@ -72,44 +89,119 @@ class AssetWidget(QFrame):
         self.label = QLabel(self.file_size)
         layout.addWidget(self.label)
 
+        self.priority_box = QSpinBox()
+        self.priority_box.setRange(-99, 99)
+        self.priority_box.setToolTip("Priority, higher values are installed first")
+        self.priority_box.valueChanged.connect(self.change_priority)
+        layout.addWidget(self.priority_box)
+
+        self.pause_button = QPushButton("Pause")
+        self.pause_button.setCheckable(True)
+        self.pause_button.toggled.connect(self.toggle_pause)
+        self.pause_button.hide()
+        layout.addWidget(self.pause_button)
+
         self.button = QPushButton("Install")
-        self.button.clicked.connect(self.install_asset)
+        self.button.clicked.connect(self.on_button_clicked)
         layout.addWidget(self.button)
 
+        self.installation_cancelled.connect(self.reset_install_widgets)
+        self.installation_finished.connect(lambda status: self.delete_widget())
+
     def _create_uninstall_widgets(self, layout):
         self.button = QPushButton("Remove")
         self.button.clicked.connect(self.remove_asset)
         layout.addWidget(self.button)
 
     def remove_from_view(self):
-        """Removes the asset widget from the UI."""
+        """
+        Removes the asset widget from the UI and cancels its install.
+
+        A running install still reports to the widget, so the widget is only
+        hidden and deleted once the install has finished.
+        """
+        if self in install_asset_list:
+            install_asset_list.remove(self)
+        if self.job is not None and self.job.is_started:
+            self.is_removed = True
+            scheduler.cancel(self.job)
+            self.hide()
+            return
+        if self.job is not None:
+            scheduler.cancel(self.job)
+            self.executor.forget(self.job)
+        self.delete_widget()
+
+    def delete_widget(self):
         if self in install_asset_list:
             install_asset_list.remove(self)
         self.setParent(None)
         self.deleteLater()
 
-    def install_asset(self):
-        self.button.setEnabled(False)
-        self.thread = QThread()
-        self.worker = Worker(self._perform_installation)
-        self.worker.progress.connect(self.progressbar.setValue)
-        self.worker.moveToThread(self.thread)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.started.connect(self.worker.run)
-        self.installation_finished.connect(
-            lambda status: self.remove_from_view()
-        )  # Single connection
-        self.thread.start()
-
-    def _perform_installation(self, progress_callback):
+    def on_button_clicked(self):
+        if self.job is None:
+            self.install_asset()
+        else:
+            self.button.setEnabled(False)
+            scheduler.cancel(self.job)
+            # A job no thread picked up yet never reports back
+            if not self.job.is_started:
+                self.executor.forget(self.job)
+                self.reset_install_widgets()
+
+    def change_priority(self, priority: int):
+        if self.job is not None:
+            scheduler.set_priority(self.job, priority)
+
+    def toggle_pause(self, is_paused: bool):
+        if self.job is None:
+            return
+        if is_paused:
+            scheduler.pause(self.job)
+            self.pause_button.setText("Resume")
+        else:
+            scheduler.resume(self.job)
+            self.pause_button.setText("Pause")
+            # Threads skip paused jobs that did not start yet
+            if not self.job.is_started:
+                self.executor.start(self, self.job)
+
+    def reset_install_widgets(self):
+        """Returns a cancelled asset to its initial state."""
+        if self.is_removed:
+            self.delete_widget()
+            return
+        self.job = None
+        self.progressbar.setValue(0)
+        self.pause_button.setChecked(False)
+        self.pause_button.hide()
+        self.button.setText("Install")
+        self.button.setEnabled(True)
+
+    def install_asset(self, job: InstallJob | None = None):
+        if job is None:
+            job = scheduler.submit(
+                self.file_path, self.file_size_bytes, self.priority_box.value()
+            )
+        self.job = job
+        self.button.setText("Cancel")
+        self.pause_button.show()
+        self.executor.start(self, job)
+
+    def perform_installation(self, job: InstallJob, progress_callback):
+        """Installs the asset on a thread of the install executor."""
+        from installer import start_installer_gui
+
         try:
             imported, exists = start_installer_gui(
                 self.file_path,
                 progress_callback=progress_callback,
                 is_delete_archive=self.window().tab_view.is_delete_archive,
+                job=job,
             )
-            if exists:
+            if job.is_cancelled:
+                self.installation_cancelled.emit()
+            elif exists:
                 self.warning_signal.emit(
                     "Asset Exists",
                     f"'{self.asset_name}' is already installed!",
@@ -126,6 +218,8 @@ class AssetWidget(QFrame):
 
     def remove_asset(self):
         """Removes the asset from the database and the uninstall list."""
+        from content_database import delete_archive
+
         delete_archive(self.asset_name)
         if self in remove_asset_list:
             remove_asset_list.remove(self)
@@ -1,10 +1,11 @@
-from pathlib import Path
+import threading
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QCheckBox,
+    QComboBox,
     QScrollArea,
     QHBoxLayout,
     QPushButton,
@@ -12,19 +13,32 @@ from PySide6.QtWidgets import (
     QMessageBox,
 )
 from GUI.asset_widget import AssetWidget
+from GUI.worker import InstallExecutor, IntakeWorker
 from helper import file_operations
-from helper.file_operations import is_file_archive
+from helper.io_governor import BACKGROUND_PROFILE, FAST_PROFILE, governor
 from GUI.shared_data import install_asset_list
+from install_scheduler import SchedulingPolicy, scheduler
+
+SCHEDULING_POLICIES = {
+    "First in, first out": SchedulingPolicy.FIFO,
+    "Smallest first": SchedulingPolicy.SHORTEST_FIRST,
+    "Largest first": SchedulingPolicy.LARGEST_FIRST,
+}
 
 
 class InstallTab(QWidget):
     """Custom widget for the Install tab with drag-and-drop support."""
 
+    plan_finished = Signal(str, str)
+
     def __init__(self, parent):
         super().__init__(parent)
+        # Shared by every asset of the tab instead of one thread per asset
+        self.install_executor = InstallExecutor(self)
         self.setup_ui()
         self.setAcceptDrops(True)  # Enable drops for this widget
         self.is_delete_archive = False
+        self.intake_threads = []
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -57,6 +71,29 @@ class InstallTab(QWidget):
         )
         bottom_layout.addWidget(self.del_archive_checkbox)
 
+        self.policy_box = QComboBox()
+        self.policy_box.setToolTip("Order in which the selected assets are installed")
+        self.policy_box.addItems(SCHEDULING_POLICIES)
+        self.policy_box.setCurrentIndex(
+            list(SCHEDULING_POLICIES.values()).index(scheduler.policy)
+        )
+        self.policy_box.currentTextChanged.connect(
+            lambda text: scheduler.set_policy(SCHEDULING_POLICIES[text])
+        )
+        bottom_layout.addWidget(self.policy_box)
+
+        self.background_checkbox = QCheckBox("Background mode")
+        self.background_checkbox.setToolTip(
+            "Limit the disk usage of installs so DAZ Studio stays responsive"
+        )
+        self.background_checkbox.setChecked(governor.is_background)
+        self.background_checkbox.toggled.connect(
+            lambda checked: governor.set_profile(
+                BACKGROUND_PROFILE if checked else FAST_PROFILE
+            )
+        )
+        bottom_layout.addWidget(self.background_checkbox)
+
         self.remove_button = QPushButton("Remove selected")
         self.remove_button.clicked.connect(self.remove_selected)
         bottom_layout.addWidget(self.remove_button)
@@ -65,6 +102,14 @@ class InstallTab(QWidget):
         self.add_asset_button.clicked.connect(self.select_file)
         bottom_layout.addWidget(self.add_asset_button)
 
+        self.plan_button = QPushButton("Dry run selected")
+        self.plan_button.setToolTip(
+            "Show what installing the selected assets would do without installing them"
+        )
+        self.plan_button.clicked.connect(self.plan_assets)
+        self.plan_finished.connect(self.show_plan)
+        bottom_layout.addWidget(self.plan_button)
+
         self.install_button = QPushButton("Install selected")
         self.install_button.clicked.connect(self.install_assets)
         bottom_layout.addWidget(self.install_button)
@@ -77,22 +122,59 @@ class InstallTab(QWidget):
         for asset in install_asset_list:
             asset.checkbox.setChecked(checked)
 
-    def add_asset_widget(self, asset_name: str, asset_path: str):
+    def add_asset_widget(
+        self, asset_name: str, asset_path: str, file_size: int | None = None
+    ):
         """Adds a new asset widget to the install scroll area."""
-        asset = AssetWidget(self.scroll_content, "Install", asset_name, asset_path)
+        asset = AssetWidget(
+            self.scroll_content,
+            "Install",
+            asset_name,
+            asset_path,
+            file_size,
+            self.install_executor,
+        )
         self.scroll_layout.insertWidget(self.scroll_layout.count() - 1, asset)
         install_asset_list.append(asset)
 
+    def add_asset_batch(self, archives: list[tuple[str, int]]):
+        """Adds a batch of scanned archives to the install scroll area."""
+        self.scroll_content.setUpdatesEnabled(False)
+        for file_path, file_size in archives:
+            asset_name = file_operations.get_archive_name(file_path)
+            self.add_asset_widget(asset_name, file_path, file_size)
+        self.scroll_content.setUpdatesEnabled(True)
+
+    def start_intake(self, paths: list[str]):
+        """Scans files and folders for archives on a background thread."""
+        thread = QThread()
+        worker = IntakeWorker(paths, {asset.file_path for asset in install_asset_list})
+        worker.moveToThread(thread)
+        worker.batch_ready.connect(self.add_asset_batch)
+        worker.finished.connect(self.show_intake_summary)
+        worker.finished.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        thread.started.connect(worker.run)
+        thread.finished.connect(lambda: self.intake_threads.remove((thread, worker)))
+        self.intake_threads.append((thread, worker))
+        thread.start()
+
+    def show_intake_summary(self, rejected: list[str]):
+        """Shows a single summary for all files that were not added."""
+        if not rejected:
+            return
+        details = "\n".join(rejected[:20])
+        if len(rejected) > 20:
+            details += f"\n... and {len(rejected) - 20} more"
+        QMessageBox.information(
+            self, "Info", f"{len(rejected)} file(s) were not added:\n\n{details}"
+        )
+
     def select_file(self):
         """Prompts user to select a file and adds an asset widget."""
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Asset File")
         if file_path:
-            file_name = Path(file_path).name
-            if is_file_archive(file_name):
-                asset_name = file_operations.get_file_name_without_extension(file_name)
-                self.add_asset_widget(asset_name, file_path)
-            else:
-                QMessageBox.information(self, "Info", "The File is not an archive")
+            self.start_intake([file_path])
 
     @staticmethod
     def remove_selected():
@@ -109,25 +191,72 @@ class InstallTab(QWidget):
         )
         if msg == QMessageBox.StandardButton.Yes:
             self.install_button.setEnabled(False)
-            for asset in install_asset_list.copy():
-                if asset.checkbox.isChecked():
-                    asset.install_asset()
+            # Queue every asset before the first one starts so the scheduler
+            # can pick the order according to its policy
+            selected_assets = [
+                asset
+                for asset in install_asset_list
+                if asset.checkbox.isChecked() and asset.job is None
+            ]
+            jobs = [
+                scheduler.submit(
+                    asset.file_path, asset.file_size_bytes, asset.priority_box.value()
+                )
+                for asset in selected_assets
+            ]
+            for asset, job in zip(selected_assets, jobs):
+                asset.install_asset(job)
             self.install_button.setEnabled(True)
             self.check_install.setChecked(False)
 
+    def plan_assets(self):
+        """Plans the selected assets from their listings on a background thread."""
+        paths = [
+            asset.file_path
+            for asset in install_asset_list
+            if asset.checkbox.isChecked()
+        ]
+        if paths:
+            self.plan_button.setEnabled(False)
+            threading.Thread(target=self._run_plan, args=(paths,), daemon=True).start()
+
+    def _run_plan(self, paths: list[str]):
+        from install_planner import plan_installs
+        from helper.file_operations import convert_size
+
+        try:
+            plans = plan_installs(paths)
+        except Exception as e:
+            self.plan_finished.emit(f"Dry run failed: {e}", "")
+            return
+        total_bytes = sum(plan.total_bytes for plan in plans)
+        estimated_minutes = sum(plan.estimated_seconds for plan in plans) / 60
+        summary = (
+            f"{sum(plan.is_installable for plan in plans)} of {len(plans)} assets "
+            f"can be installed.\n\n"
+            f"Files: {sum(plan.file_count for plan in plans)}\n"
+            f"Size: {convert_size(total_bytes)}\n"
+            f"Overwritten library files: {sum(len(plan.conflicts) for plan in plans)}\n"
+            f"Estimated time: {estimated_minutes:.1f} min"
+        )
+        details = "\n\n".join(plan.describe() for plan in plans)
+        self.plan_finished.emit(summary, details)
+
+    def show_plan(self, summary: str, details: str):
+        self.plan_button.setEnabled(True)
+        msg_box = QMessageBox(self)
+        msg_box.setWindowTitle("Dry run")
+        msg_box.setText(summary)
+        msg_box.setDetailedText(details)
+        msg_box.exec()
+
     def dragEnterEvent(self, event):
         """Accept drag events if the dragged content contains files."""
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
 
     def dropEvent(self, event):
-        """Handle dropped files."""
+        """Handle dropped files and folders."""
         files = [url.toLocalFile() for url in event.mimeData().urls()]
-        for file_path in files:
-            if is_file_archive(file_path):
-                file_name = Path(file_path).name
-                asset_name = file_operations.get_file_name_without_extension(file_name)
-                self.add_asset_widget(asset_name, file_path)
-            else:
-                QMessageBox.information(self, "Info", "The File is not an archive")
+        self.start_intake(files)
         event.acceptProposedAction()
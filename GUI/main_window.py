@@ -1,15 +1,24 @@
+import logging
 import os
+import threading
+import time
+from PySide6.QtCore import QEvent, QTimer, Signal
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QMessageBox
-from helper import file_operations, updater
+from helper import file_operations
 from GUI.gui_utilities import center_window
 from GUI.tab_view import MyTabView
 
+logger = logging.getLogger(__name__)
+
 
 class App(QMainWindow):
     local_version = "v0.9.3"
 
-    def __init__(self):
+    update_available = Signal()
+
+    def __init__(self, startup_time: float | None = None):
         super().__init__()
+        self.startup_time = startup_time
         self.setWindowTitle(f"Daz Content Installer {self.local_version}")
         center_window(self, 1100, 650)
 
@@ -22,8 +31,17 @@ class App(QMainWindow):
         self.tab_view = MyTabView(self)
         layout.addWidget(self.tab_view)
 
-        # Initial setup checks
-        self.initial_checks()
+        self.update_available.connect(self.show_update_message)
+
+        # Initial setup checks run once the window has been painted
+        QTimer.singleShot(0, self.initial_checks)
+
+    def event(self, event):
+        if event.type() == QEvent.Type.Paint and self.startup_time is not None:
+            elapsed = (time.perf_counter() - self.startup_time) * 1000
+            logger.info(f"Time to first paint: {elapsed:.0f} ms")
+            self.startup_time = None
+        return super().event(event)
 
     def initial_checks(self):
         if file_operations.create_database_folder():
@@ -39,12 +57,32 @@ class App(QMainWindow):
             if msg == QMessageBox.StandardButton.Yes:
                 os.startfile("config.ini")
 
+        threading.Thread(target=self._open_database, daemon=True).start()
+        threading.Thread(target=self._check_for_update, daemon=True).start()
+
+    @staticmethod
+    def _open_database():
+        """Loads the installer modules and prepares the database in the background."""
+        import content_database
+        import installer
+
+        installer.clean_stale_job_folders()
+        content_database.connect_database().close()
+
+    def _check_for_update(self):
+        from helper import updater
+
         if updater.is_new_update_available(self.local_version):
-            msg = QMessageBox.question(
-                self,
-                "Info",
-                "A new update is available! Do you want to open the GitHub repository?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            )
-            if msg == QMessageBox.StandardButton.Yes:
-                updater.open_release_page()
+            self.update_available.emit()
+
+    def show_update_message(self):
+        from helper import updater
+
+        msg = QMessageBox.question(
+            self,
+            "Info",
+            "A new update is available! Do you want to open the GitHub repository?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if msg == QMessageBox.StandardButton.Yes:
+            updater.open_release_page()
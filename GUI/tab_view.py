@@ -1,7 +1,11 @@
+import threading
+
+from PySide6.QtCore import QTimer, Signal
 from PySide6.QtWidgets import (
     QTabWidget,
     QVBoxLayout,
     QCheckBox,
+    QLineEdit,
     QScrollArea,
     QWidget,
     QPushButton,
@@ -11,15 +15,19 @@ from PySide6.QtWidgets import (
 from GUI.asset_widget import AssetWidget
 from GUI.install_tab import InstallTab
 from GUI.shared_data import remove_asset_list
-from content_database import get_archives
 
 
 class MyTabView(QTabWidget):
     """Custom tab view for managing install and uninstall tabs."""
 
+    search_finished = Signal(int, list)
+
     def __init__(self, parent):
         super().__init__(parent)
         self.is_delete_archive = False
+        # Incremented per search so results of outdated queries are dropped
+        self.search_generation = 0
+        self.is_searching = False
         self.setup_ui()
 
     def setup_ui(self):
@@ -39,6 +47,18 @@ class MyTabView(QTabWidget):
         self.check_uninstall.stateChanged.connect(self.toggle_uninstall_checkboxes)
         layout.addWidget(self.check_uninstall)
 
+        # Filter box, the search runs once typing pauses
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Filter by asset name or installed file")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.start_search)
+        self.search_box.textChanged.connect(self.search_timer.start)
+        self.search_finished.connect(self.show_search_results)
+        layout.addWidget(self.search_box)
+
         # Scroll area
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
@@ -73,18 +93,51 @@ class MyTabView(QTabWidget):
 
     def refresh_tab(self, index):
         if self.tabText(index) == "Uninstall":
-            # Clear existing widgets
-            while self.uninstall_scroll_layout.count() > 1:
-                item = self.uninstall_scroll_layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
-
-            # Add new assets
-            assets = get_archives()
-            remove_asset_list.clear()
-            for asset in assets:
-                widget = AssetWidget(
-                    self.uninstall_scroll_content, "Uninstall", asset_name=asset[0]
-                )
-                self.uninstall_scroll_layout.insertWidget(0, widget)
-                remove_asset_list.append(widget)
+            self.start_search()
+
+    def start_search(self):
+        """
+        Queries the database for matching assets on a background thread.
+
+        Only one query runs at a time. If the text changes meanwhile, the
+        current text is searched once the running query has finished.
+        """
+        self.search_generation += 1
+        if self.is_searching:
+            return
+        self.is_searching = True
+        threading.Thread(
+            target=self._run_search,
+            args=(self.search_generation, self.search_box.text()),
+            daemon=True,
+        ).start()
+
+    def _run_search(self, generation: int, text: str):
+        from content_database import search_archives
+
+        assets = []
+        try:
+            assets = search_archives(text)
+        finally:
+            self.search_finished.emit(generation, assets)
+
+    def show_search_results(self, generation: int, assets: list):
+        self.is_searching = False
+        if generation != self.search_generation:
+            self.start_search()
+            return
+
+        # Clear existing widgets
+        while self.uninstall_scroll_layout.count() > 1:
+            item = self.uninstall_scroll_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+
+        # Add new assets
+        remove_asset_list.clear()
+        for asset in assets:
+            widget = AssetWidget(
+                self.uninstall_scroll_content, "Uninstall", asset_name=asset[0]
+            )
+            self.uninstall_scroll_layout.insertWidget(0, widget)
+            remove_asset_list.append(widget)
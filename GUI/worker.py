@@ -1,20 +1,171 @@
-from PySide6.QtCore import QObject, Signal
+import logging
+import pathlib
+import threading
 
+from PySide6.QtCore import (
+    QCoreApplication,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QTimer,
+    Signal,
+)
 
-class Worker(QObject):
-    finished = Signal()
-    progress = Signal(float)
+from GUI.shared_data import install_asset_list
+from helper import file_operations
+from install_scheduler import InstallJob, scheduler
 
-    def __init__(self, target_function, *args, **kwargs):
+logger = logging.getLogger(__name__)
+
+# Progress bars are updated at most this many times per second
+PROGRESS_FRAME_RATE = 30
+# Milliseconds cancelled installs get to clean up when the app closes
+SHUTDOWN_TIMEOUT = 30000
+
+
+class InstallRunnable(QRunnable):
+    """Runs the queued job the scheduler picks when a pool thread is free."""
+
+    def __init__(self, run_job):
         super().__init__()
-        self.target_function = target_function
-        self.args = args
-        self.kwargs = kwargs
+        self.run_job = run_job
 
     def run(self):
+        job = scheduler.take_next_job()
+        if job is not None:
+            self.run_job(job)
+
+
+class InstallExecutor(QObject):
+    """
+    Runs installs on a fixed number of pool threads.
+
+    There is one runnable per started asset, but only as many threads as the
+    scheduler has slots in both phases plus one, so a job can wait for the
+    copy slot while the extraction slots stay busy. Which job a free thread
+    runs is decided by the scheduler at that moment, so priority and policy
+    changes apply to queued jobs. Progress values are collected from the
+    threads and shown by a timer at a fixed frame rate instead of sending
+    one queued signal per value. When the app quits every install is
+    cancelled and given time to remove its partial files.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(sum(scheduler.limits.values()) + 1)
+        self.widgets = {}
+        self.pending_progress = {}
+        self.progress_lock = threading.Lock()
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(1000 // PROGRESS_FRAME_RATE)
+        self.progress_timer.timeout.connect(self.flush_progress)
+        QCoreApplication.instance().aboutToQuit.connect(self.shutdown)
+
+    def start(self, widget, job: InstallJob):
+        """Queues a runnable for the job, the widget is installed when it runs."""
+        self.widgets[job] = widget
+        self.thread_pool.start(InstallRunnable(self._run_job))
+        self.progress_timer.start()
+
+    def shutdown(self):
+        """Cancels queued and running installs and waits for the threads."""
+        scheduler.cancel_all()
+        self.thread_pool.clear()
+        if not self.thread_pool.waitForDone(SHUTDOWN_TIMEOUT):
+            logger.warning("Installs did not stop in time, closing anyway")
+
+    def forget(self, job: InstallJob):
+        """Drops a job that was cancelled before any thread picked it up."""
+        self.widgets.pop(job, None)
+
+    def _run_job(self, job: InstallJob):
+        widget = self.widgets.get(job)
+        if widget is None:
+            # The widget was removed after the job was handed to this thread,
+            # nothing else will take the started job out of the queue
+            scheduler.finish(job)
+            return
         try:
-            self.target_function(
-                *self.args, progress_callback=self.progress.emit, **self.kwargs
+            widget.perform_installation(
+                job, lambda value: self.report_progress(widget, value)
             )
         finally:
-            self.finished.emit()
+            self.widgets.pop(job, None)
+
+    def report_progress(self, widget, value: float):
+        with self.progress_lock:
+            self.pending_progress[widget] = value
+
+    def flush_progress(self):
+        with self.progress_lock:
+            updates, self.pending_progress = self.pending_progress, {}
+        for widget, value in updates.items():
+            # Widgets that were removed in the meantime are deleted already
+            if widget in install_asset_list:
+                widget.progressbar.setValue(int(value))
+        if not updates and not self.widgets:
+            self.progress_timer.stop()
+
+
+class IntakeWorker(QObject):
+    """Collects dropped archives off the GUI thread and reports them in batches."""
+
+    batch_ready = Signal(list)
+    finished = Signal(list)
+
+    def __init__(self, paths: list[str], queued_paths: set[str]):
+        super().__init__()
+        self.paths = paths
+        self.queued_paths = queued_paths
+
+    def run(self):
+        from content_database import get_existing_archive_names
+
+        rejected = []
+        try:
+            for archives, not_archives in file_operations.scan_archives(self.paths):
+                rejected.extend(
+                    (
+                        f"{path} (part of a multi-part archive, add its first part)"
+                        if file_operations.is_file_archive(path)
+                        else f"{path} (not an archive)"
+                    )
+                    for path in not_archives
+                )
+                installed = get_existing_archive_names(
+                    [
+                        archive_name
+                        for path, _ in archives
+                        for archive_name in file_operations.get_archive_names(path)
+                    ]
+                )
+                accepted = []
+                for path, size in archives:
+                    if path in self.queued_paths:
+                        rejected.append(f"{path} (already in the list)")
+                    elif not installed.isdisjoint(
+                        file_operations.get_archive_names(path)
+                    ) or self.is_bundle_installed(path):
+                        rejected.append(f"{path} (already installed)")
+                    else:
+                        self.queued_paths.add(path)
+                        accepted.append((path, size))
+                if accepted:
+                    self.batch_ready.emit(accepted)
+        finally:
+            self.finished.emit(rejected)
+
+    @staticmethod
+    def is_bundle_installed(path: str) -> bool:
+        """Checks the content root names a bundle is stored under."""
+        from helper.archive_formats import list_archive
+        from helper.extractor import ExtractionError
+        from installer import is_listing_installed
+
+        try:
+            members = list_archive(pathlib.Path(path))
+        except ExtractionError:
+            # Unreadable archives are reported when they are installed
+            return False
+        return is_listing_installed(pathlib.Path(path), [name for name, _ in members])
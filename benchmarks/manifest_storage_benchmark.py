@@ -0,0 +1,165 @@
+"""
+Compares the legacy file table with the normalized manifest storage.
+
+A synthetic library of texture-heavy products is written to a database with
+the legacy schema, where every file stores its full path, and to one with the
+current schema. The benchmark reports the database size, the insert time, the
+time to list all archives with their file counts and the time to stream the
+files of one archive. The size and insert time of the current schema include
+its search index, which the legacy schema does not have, and the time of a few
+searches is reported in milliseconds for it alone.
+
+Usage:
+    python benchmarks/manifest_storage_benchmark.py [--files 5000000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+import content_database  # noqa: E402
+
+FILES_PER_ARCHIVE = 2500
+ARCHIVES_PER_TRANSACTION = 200
+SEARCHES = ["Vendor23 Product 00123", "texture", "runtime textures", "genesis 0005"]
+
+
+def generate_archives(file_count: int):
+    """Yields archive names with file lists that share long directory prefixes."""
+    for archive_index in range(file_count // FILES_PER_ARCHIVE):
+        vendor = f"Vendor{archive_index % 50:02d}"
+        product = f"Product {archive_index:05d} Deluxe Texture Expansion"
+        files = []
+        for file_index in range(FILES_PER_ARCHIVE):
+            if file_index % 5 == 0:
+                folder = os.path.join(
+                    "People", "Genesis 9", "Clothing", vendor, product, "Materials"
+                )
+                files.append(os.path.join(folder, f"Material {file_index:04d}.duf"))
+            else:
+                folder = os.path.join(
+                    "Runtime", "Textures", vendor, product, f"Set{file_index % 20:02d}"
+                )
+                files.append(os.path.join(folder, f"texture_{file_index:04d}_d.jpg"))
+        yield f"{vendor} {product}", files
+
+
+def batched(archives):
+    batch = []
+    for archive in archives:
+        batch.append(archive)
+        if len(batch) == ARCHIVES_PER_TRANSACTION:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def benchmark_legacy(db_path: str, file_count: int) -> dict[str, float]:
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE archives (id INTEGER PRIMARY KEY, archive_name TEXT NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE files (id INTEGER PRIMARY KEY, archive_id INTEGER, "
+        "file_name TEXT NOT NULL)"
+    )
+    start = time.perf_counter()
+    for batch in batched(generate_archives(file_count)):
+        with conn:
+            for archive_name, files in batch:
+                archive_id = conn.execute(
+                    "INSERT INTO archives (archive_name) VALUES (?)", (archive_name,)
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO files (archive_id, file_name) VALUES (?, ?)",
+                    [(archive_id, file_name) for file_name in files],
+                )
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    archive_ids = conn.execute("SELECT id FROM archives").fetchall()
+    for (archive_id,) in archive_ids:
+        conn.execute(
+            "SELECT COUNT(*) FROM files WHERE archive_id = ?", (archive_id,)
+        ).fetchone()
+    list_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    last_id = archive_ids[-1][0]
+    cursor = conn.execute(
+        "SELECT file_name FROM files WHERE archive_id = ?", (last_id,)
+    )
+    while cursor.fetchmany(10000):
+        pass
+    stream_time = time.perf_counter() - start
+    conn.close()
+    return {
+        "insert": insert_time,
+        "list archives": list_time,
+        "stream one archive": stream_time,
+    }
+
+
+def benchmark_normalized(db_path: str, file_count: int) -> dict[str, float]:
+    content_database.DATABASE_PATH = db_path
+    start = time.perf_counter()
+    for batch in batched(generate_archives(file_count)):
+        content_database.add_archives(batch)
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    archives = content_database.get_archives()
+    list_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with content_database.connect_database() as conn:
+        (last_id,) = conn.execute("SELECT MAX(id) FROM archives").fetchone()
+        for _ in content_database.iter_archive_files(conn, last_id):
+            pass
+    stream_time = time.perf_counter() - start
+    assert len(archives) == file_count // FILES_PER_ARCHIVE
+
+    timings = {
+        "insert": insert_time,
+        "list archives": list_time,
+        "stream one archive": stream_time,
+    }
+    for text in SEARCHES:
+        start = time.perf_counter()
+        content_database.search_archives(text)
+        timings[f"search (ms) {text}"] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        results = {}
+        for name, benchmark in [
+            ("legacy", benchmark_legacy),
+            ("normalized", benchmark_normalized),
+        ]:
+            db_path = os.path.join(folder, f"{name}.db")
+            timings = benchmark(db_path, args.files)
+            timings["size (MB)"] = os.path.getsize(db_path) / 1024**2
+            results[name] = timings
+
+    print(f"{'':36}{'legacy':>12}{'normalized':>12}")
+    for metric, normalized in results["normalized"].items():
+        legacy = results["legacy"].get(metric)
+        legacy = "-" if legacy is None else f"{legacy:.2f}"
+        print(f"{metric:36}{legacy:>12}{normalized:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
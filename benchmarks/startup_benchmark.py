@@ -0,0 +1,110 @@
+"""
+Measures the startup time of the GUI entry point.
+
+The benchmark reports the slowest imports of the GUI package measured with
+``python -X importtime`` and the wall-clock time from process start until the
+main window is painted for the first time.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_PATH = Path(__file__).parent.parent.absolute()
+TARGET_MS = 500
+# Modules that must not be imported before the window is shown
+LAZY_MODULES = ["installer", "helper.extractor", "content_database", "helper.updater"]
+
+
+def run_child() -> None:
+    """Shows the main window and exits as soon as it has been painted."""
+    sys.path.insert(0, str(REPO_PATH))
+    from PySide6.QtCore import QEvent, QObject
+    from PySide6.QtWidgets import QApplication
+    from GUI.main_window import App
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Type.Paint:
+                print(f"first-paint {time.time()}", flush=True)
+                os._exit(0)
+            return False
+
+    app = QApplication(sys.argv)
+    window = App()
+    paint_filter = FirstPaintFilter()
+    window.installEventFilter(paint_filter)
+    window.show()
+    app.exec()
+
+
+def measure_first_paint() -> float:
+    """Returns the milliseconds from process spawn until the first paint."""
+    start = time.time()
+    result = subprocess.run(
+        [sys.executable, __file__, "--child"],
+        cwd=REPO_PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("first-paint"):
+            return (float(line.split()[1]) - start) * 1000
+    raise RuntimeError(f"The window was never painted:\n{result.stderr}")
+
+
+def measure_imports() -> list[tuple[int, str]]:
+    """Returns the cumulative import time in microseconds of every module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import GUI.main_window"],
+        cwd=REPO_PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        imports.append((int(cumulative), module.strip()))
+    return imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    imports = measure_imports()
+    print("Slowest imports (cumulative):")
+    for cumulative, module in sorted(imports, reverse=True)[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+    eager_modules = [module for _, module in imports if module in LAZY_MODULES]
+    if eager_modules:
+        print(f"Imported eagerly: {', '.join(eager_modules)}")
+
+    timings = [measure_first_paint() for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(
+        f"Time to first paint: median {median:.0f} ms, "
+        f"min {min(timings):.0f} ms, max {max(timings):.0f} ms"
+    )
+    print(f"Target {TARGET_MS} ms: {'PASS' if median < TARGET_MS else 'FAIL'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,177 @@
 import logging
+import os
+import re
 import sqlite3
 import threading
+import time
 from pathlib import Path
 
-from helper.config_operations import get_library_path, get_debug_mode
+from helper.config_operations import get_library_path
+
+DATABASE_PATH = "database/archives.db"
 
 lock = threading.Lock()
+migration_lock = threading.Lock()
+
+# Words as the FTS5 unicode61 tokenizer finds them, underscores separate words
+SEARCH_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+def _normalize_file_paths(conn: sqlite3.Connection) -> None:
+    """
+    Store each file as a directory reference plus its leaf name.
+
+    Products repeat the same long directory prefixes for thousands of files,
+    so every directory path is stored once in the directories table.
+    """
+    conn.execute("""
+        CREATE TABLE directories (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE normalized_files (
+            id INTEGER PRIMARY KEY,
+            archive_id INTEGER NOT NULL,
+            directory_id INTEGER NOT NULL,
+            leaf_name TEXT NOT NULL,
+            size INTEGER,
+            mtime_ns INTEGER,
+            FOREIGN KEY (archive_id) REFERENCES archives (id) ON DELETE CASCADE,
+            FOREIGN KEY (directory_id) REFERENCES directories (id)
+        )
+    """)
+    directory_ids = {}
+    cursor = conn.execute("SELECT id, archive_id, file_name, size, mtime_ns FROM files")
+    while rows := cursor.fetchmany(10000):
+        normalized_rows = []
+        for file_id, archive_id, file_name, size, mtime_ns in rows:
+            directory, leaf_name = os.path.split(file_name)
+            if directory not in directory_ids:
+                directory_ids[directory] = conn.execute(
+                    "INSERT INTO directories (path) VALUES (?)", (directory,)
+                ).lastrowid
+            directory_id = directory_ids[directory]
+            normalized_rows.append(
+                (file_id, archive_id, directory_id, leaf_name, size, mtime_ns)
+            )
+        conn.executemany(
+            "INSERT INTO normalized_files VALUES (?, ?, ?, ?, ?, ?)", normalized_rows
+        )
+    conn.execute("DROP TABLE files")
+    conn.execute("ALTER TABLE normalized_files RENAME TO files")
+    conn.execute("CREATE INDEX files_archive_id ON files (archive_id)")
+    conn.execute("CREATE INDEX files_directory_id ON files (directory_id)")
+    conn.execute(
+        "ALTER TABLE archives ADD COLUMN file_count INTEGER NOT NULL DEFAULT 0"
+    )
+    conn.execute("""
+        UPDATE archives SET file_count = (
+            SELECT COUNT(*) FROM files WHERE files.archive_id = archives.id
+        )
+    """)
+
+
+def _get_path_terms(texts) -> str:
+    """
+    Return the distinct words of directory paths and file names as one text.
+
+    The words are split like the FTS5 tokenizer splits them, so repeating
+    them per file would only make the archive's search document larger.
+    """
+    words = set(SEARCH_WORD_PATTERN.findall("\n".join(texts).lower()))
+    return " ".join(sorted(words))
+
+
+def _add_search_index(conn: sqlite3.Connection) -> None:
+    """
+    Index each archive's name together with the words of its installed paths.
+
+    Every archive is a single document, so a search only has to look at as
+    many documents as there are archives instead of every file.
+    """
+    conn.execute("ALTER TABLE archives ADD COLUMN path_terms TEXT NOT NULL DEFAULT ''")
+    archive_ids = [
+        archive_id for (archive_id,) in conn.execute("SELECT id FROM archives")
+    ]
+    for archive_id in archive_ids:
+        path_terms = _get_path_terms(iter_archive_files(conn, archive_id))
+        conn.execute(
+            "UPDATE archives SET path_terms = ? WHERE id = ?", (path_terms, archive_id)
+        )
+    conn.execute("""
+        CREATE VIRTUAL TABLE archive_search USING fts5(
+            archive_name, path_terms, content='archives', content_rowid='id',
+            detail=none
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER archives_search_insert AFTER INSERT ON archives BEGIN
+            INSERT INTO archive_search (rowid, archive_name, path_terms)
+            VALUES (new.id, new.archive_name, new.path_terms);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER archives_search_delete AFTER DELETE ON archives BEGIN
+            INSERT INTO archive_search (archive_search, rowid, archive_name, path_terms)
+            VALUES ('delete', old.id, old.archive_name, old.path_terms);
+        END
+    """)
+    conn.execute("INSERT INTO archive_search (archive_search) VALUES ('rebuild')")
 
 
-def connect_database(db_path: str = "database/archives.db") -> sqlite3.Connection:
+# Schema changes applied in order, the index + 1 is stored as the user_version.
+# A migration is either a list of statements or a function taking the connection.
+MIGRATIONS = [
+    [
+        "ALTER TABLE files ADD COLUMN size INTEGER",
+        "ALTER TABLE files ADD COLUMN mtime_ns INTEGER",
+        """
+            CREATE TABLE IF NOT EXISTS library_directories (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL
+            )
+        """,
+    ],
+    _normalize_file_paths,
+    _add_search_index,
+    [
+        """
+            CREATE TABLE install_history (
+                id INTEGER PRIMARY KEY,
+                installed_at REAL NOT NULL,
+                bytes INTEGER NOT NULL,
+                file_count INTEGER NOT NULL,
+                seconds REAL NOT NULL
+            )
+        """,
+    ],
+]
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Bring an existing database up to the current schema version."""
+    with migration_lock:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for index, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            conn.execute("BEGIN")
+            try:
+                if callable(migration):
+                    migration(conn)
+                else:
+                    for statement in migration:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {index}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+
+def connect_database(db_path: str | None = None) -> sqlite3.Connection:
     """Connect to the SQLite database and ensure necessary tables exist."""
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path or DATABASE_PATH)
     conn.execute("PRAGMA foreign_keys = ON")
 
     with conn:
@@ -28,9 +189,76 @@ def connect_database(db_path: str = "database/archives.db") -> sqlite3.Connectio
                 FOREIGN KEY (archive_id) REFERENCES archives (id) ON DELETE CASCADE
             )
         """)
+    _migrate(conn)
     return conn
 
 
+def _get_directory_ids(cursor: sqlite3.Cursor, directories: set[str]) -> dict[str, int]:
+    """Return the ids of the given directory paths, adding those that are new."""
+    cursor.executemany(
+        "INSERT OR IGNORE INTO directories (path) VALUES (?)",
+        [(directory,) for directory in directories],
+    )
+    directory_ids = {}
+    directories = list(directories)
+    for i in range(0, len(directories), 500):
+        batch = directories[i : i + 500]
+        placeholders = ", ".join("?" * len(batch))
+        cursor.execute(
+            f"SELECT path, id FROM directories WHERE path IN ({placeholders})", batch
+        )
+        directory_ids.update(cursor.fetchall())
+    return directory_ids
+
+
+def insert_archive(cursor: sqlite3.Cursor, archive_name: str, files: list[str]) -> int:
+    """
+    Insert an archive and its files with the given cursor.
+
+    Returns:
+        int: The id of the new archive.
+    """
+    split_files = [os.path.split(file_name) for file_name in files]
+    directories = {directory for directory, _ in split_files}
+    path_terms = _get_path_terms(
+        [*directories, *(leaf_name for _, leaf_name in split_files)]
+    )
+    cursor.execute(
+        "INSERT INTO archives (archive_name, file_count, path_terms) VALUES (?, ?, ?)",
+        (archive_name, len(files), path_terms),
+    )
+    archive_id = cursor.lastrowid
+    directory_ids = _get_directory_ids(cursor, directories)
+    cursor.executemany(
+        "INSERT INTO files (archive_id, directory_id, leaf_name) VALUES (?, ?, ?)",
+        [
+            (archive_id, directory_ids[directory], leaf_name)
+            for directory, leaf_name in split_files
+        ],
+    )
+    return archive_id
+
+
+def iter_archive_files(conn: sqlite3.Connection, archive_id: int):
+    """
+    Stream the paths of an archive's files without loading them all at once.
+
+    Yields:
+        str: The path of each file relative to the library.
+    """
+    cursor = conn.execute(
+        """
+        SELECT directories.path, files.leaf_name FROM files
+        JOIN directories ON directories.id = files.directory_id
+        WHERE files.archive_id = ?
+        """,
+        (archive_id,),
+    )
+    while rows := cursor.fetchmany(10000):
+        for directory, leaf_name in rows:
+            yield os.path.join(directory, leaf_name)
+
+
 def add_archive(archive_name: str, files: list[str]) -> None:
     """
     Add a new archive and its associated files to the database.
@@ -42,19 +270,27 @@ def add_archive(archive_name: str, files: list[str]) -> None:
     with connect_database() as conn:
         cursor = conn.cursor()
         try:
-            cursor.execute(
-                "INSERT INTO archives (archive_name) VALUES (?)", (archive_name,)
-            )
-            archive_id = cursor.lastrowid
-            cursor.executemany(
-                "INSERT INTO files (archive_id, file_name) VALUES (?, ?)",
-                [(archive_id, file_name) for file_name in files],
-            )
+            insert_archive(cursor, archive_name, files)
             logging.info(f"Archive '{archive_name}' added with {len(files)} files.")
         except sqlite3.IntegrityError:
             logging.error(f"Archive '{archive_name}' already exists. Skipping.")
 
 
+def add_archives(archives: list[tuple[str, list[str]]]) -> None:
+    """
+    Add many archives and their files to the database in a single transaction.
+
+    Args:
+        archives (list[tuple[str, list[str]]]): Tuples of archive name and the
+            file names to associate with the archive.
+    """
+    with lock, connect_database() as conn:
+        cursor = conn.cursor()
+        for archive_name, files in archives:
+            insert_archive(cursor, archive_name, files)
+    logging.info(f"Added {len(archives)} archives in a single transaction.")
+
+
 def get_archives() -> list[tuple[str, str]]:
     """
     Retrieve a list of all archives and their file counts.
@@ -64,26 +300,21 @@ def get_archives() -> list[tuple[str, str]]:
     """
     with connect_database() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT id, archive_name FROM archives")
-        archives = cursor.fetchall()
-
-        archive_list = []
-        for archive_id, archive_name in archives:
-            cursor.execute(
-                "SELECT COUNT(*) FROM files WHERE archive_id = ?", (archive_id,)
-            )
-            file_count = cursor.fetchone()[0]
-            archive_list.append((archive_name, f"{file_count} files"))
+        cursor.execute("SELECT archive_name, file_count FROM archives")
+        return [
+            (archive_name, f"{file_count} files")
+            for archive_name, file_count in cursor.fetchall()
+        ]
 
-        return archive_list
 
-
-def delete_archive(archive_name: str) -> None:
+def delete_archive(archive_name: str, delete_files: bool = True) -> None:
     """
     Delete an archive and its associated files from the database and filesystem.
 
     Args:
         archive_name (str): The name of the archive to delete.
+        delete_files (bool): Also delete its files from the library. Without it
+            only the database entry is removed.
     """
     with lock:  # Ensure thread safety
         with connect_database() as conn:
@@ -98,25 +329,38 @@ def delete_archive(archive_name: str) -> None:
                 return
 
             archive_id = result[0]
-            cursor.execute(
-                "SELECT file_name FROM files WHERE archive_id = ?", (archive_id,)
-            )
-            files = cursor.fetchall()
 
             # Delete associated files from the filesystem
-            for (file_name,) in files:
-                file_path = Path(get_library_path()) / file_name
+            library_path = Path(get_library_path())
+            file_names = iter_archive_files(conn, archive_id) if delete_files else []
+            for file_name in file_names:
+                file_path = library_path / file_name
                 try:
                     if file_path.exists():
                         file_path.unlink()
-                        if get_debug_mode():
-                            logging.info(f"Deleted file: {file_path}")
+                        # Lazy formatting, free unless debug mode enabled the level
+                        logging.debug("Deleted file: %s", file_path)
                 except Exception as e:
                     logging.error(f"Error deleting file {file_path}: {e}")
 
             # Delete the archive and its entries in the database
+            directory_ids = cursor.execute(
+                "SELECT DISTINCT directory_id FROM files WHERE archive_id = ?",
+                (archive_id,),
+            ).fetchall()
             cursor.execute("DELETE FROM archives WHERE id = ?", (archive_id,))
-            logging.info(f"Archive '{archive_name}' and its files have been deleted.")
+            cursor.executemany(
+                """
+                DELETE FROM directories WHERE id = ? AND NOT EXISTS (
+                    SELECT 1 FROM files WHERE files.directory_id = directories.id
+                )
+                """,
+                directory_ids,
+            )
+            if delete_files:
+                logging.info(f"Archive '{archive_name}' and its files were deleted.")
+            else:
+                logging.info(f"Archive '{archive_name}' has been removed.")
 
 
 def does_archive_exist(archive_name: str) -> bool:
@@ -130,3 +374,161 @@ def does_archive_exist(archive_name: str) -> bool:
             (archive_name,),
         )
         return cursor.fetchone()[0] == 1
+
+
+def _build_search_query(text: str) -> str:
+    """Turn user input into an FTS5 query matching every word as a prefix."""
+    words = SEARCH_WORD_PATTERN.findall(text)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_archives(text: str, limit: int = 1000) -> list[tuple[str, str]]:
+    """
+    Find archives whose name or installed file paths match the text.
+
+    Every word of the text has to match the start of a word in the archive name
+    or in one of its file paths. The words may come from different files of
+    the archive, find_archives_by_file answers which archive owns one file.
+
+    Returns:
+        list[tuple[str, str]]: The matching archive names and their file counts.
+    """
+    query = _build_search_query(text)
+    if not query:
+        return get_archives()
+
+    with connect_database() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT archives.archive_name, archives.file_count FROM archive_search
+            JOIN archives ON archives.id = archive_search.rowid
+            WHERE archive_search MATCH ?
+            LIMIT ?
+            """,
+            (query, limit),
+        )
+        return [
+            (archive_name, f"{file_count} files")
+            for archive_name, file_count in cursor.fetchall()
+        ]
+
+
+def find_archives_by_file(file_name: str) -> list[str]:
+    """
+    Return the names of the archives that installed a file.
+
+    Args:
+        file_name (str): The path of the file relative to the library.
+    """
+    directory, leaf_name = os.path.split(os.path.normpath(file_name))
+    with connect_database() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT DISTINCT archives.archive_name FROM files
+            JOIN directories ON directories.id = files.directory_id
+            JOIN archives ON archives.id = files.archive_id
+            WHERE directories.path = ? AND files.leaf_name = ?
+            """,
+            (directory, leaf_name),
+        )
+        return [archive_name for (archive_name,) in cursor.fetchall()]
+
+
+def get_existing_archive_names(archive_names: list[str]) -> set[str]:
+    """
+    Return the subset of the given archive names that exist in the database.
+
+    The names are checked in batches with a single query each instead of one
+    query per archive.
+    """
+    existing = set()
+    with connect_database() as conn:
+        cursor = conn.cursor()
+        for i in range(0, len(archive_names), 500):
+            batch = archive_names[i : i + 500]
+            placeholders = ", ".join("?" * len(batch))
+            cursor.execute(
+                "SELECT archive_name FROM archives "
+                f"WHERE archive_name IN ({placeholders})",
+                batch,
+            )
+            existing.update(name for (name,) in cursor.fetchall())
+    return existing
+
+
+def iter_file_records(conn: sqlite3.Connection):
+    """
+    Stream every file entry of the database without loading them all at once.
+
+    Yields:
+        tuple[int, str, int | None, int | None]: The file id, the path relative
+        to the library and the size and modification time stored for it.
+    """
+    cursor = conn.execute(
+        """
+        SELECT files.id, directories.path, files.leaf_name, files.size, files.mtime_ns
+        FROM files JOIN directories ON directories.id = files.directory_id
+        """
+    )
+    while rows := cursor.fetchmany(10000):
+        for file_id, directory, leaf_name, size, mtime_ns in rows:
+            yield file_id, os.path.join(directory, leaf_name), size, mtime_ns
+
+
+def update_file_stats(conn: sqlite3.Connection, stats: list[tuple[int, int, int]]):
+    """
+    Store the size and modification time of files in a single transaction.
+
+    Args:
+        stats (list[tuple[int, int, int]]): Tuples of size, mtime_ns and file id.
+    """
+    with conn:
+        conn.executemany("UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?", stats)
+
+
+def get_directory_states(conn: sqlite3.Connection) -> dict[str, int]:
+    """Return the modification time of every library directory seen by the last scan."""
+    return dict(conn.execute("SELECT path, mtime_ns FROM library_directories"))
+
+
+def set_directory_states(conn: sqlite3.Connection, states: dict[str, int]) -> None:
+    """Replace the stored directory modification times in a single transaction."""
+    with conn:
+        conn.execute("DELETE FROM library_directories")
+        conn.executemany(
+            "INSERT INTO library_directories (path, mtime_ns) VALUES (?, ?)",
+            states.items(),
+        )
+
+
+def record_install(total_bytes: int, file_count: int, seconds: float) -> None:
+    """Store the size and duration of a finished installation."""
+    with connect_database() as conn:
+        conn.execute(
+            "INSERT INTO install_history (installed_at, bytes, file_count, seconds) "
+            "VALUES (?, ?, ?, ?)",
+            (time.time(), total_bytes, file_count, seconds),
+        )
+
+
+def get_install_throughput(recent: int = 20) -> float | None:
+    """
+    Return the average bytes per second of the most recent installations.
+
+    Returns:
+        float | None: The throughput or None if nothing was installed yet.
+    """
+    with connect_database() as conn:
+        total_bytes, seconds = conn.execute(
+            """
+            SELECT SUM(bytes), SUM(seconds) FROM (
+                SELECT bytes, seconds FROM install_history ORDER BY id DESC LIMIT ?
+            )
+            """,
+            (recent,),
+        ).fetchone()
+    if not total_bytes or not seconds:
+        return None
+    return total_bytes / seconds
@@ -0,0 +1,232 @@
+"""
+Exports and imports the install database as a portable snapshot.
+
+Usage:
+    python database_snapshot.py export SNAPSHOT
+    python database_snapshot.py import SNAPSHOT [--batch-size 50000]
+    python database_snapshot.py backup DATABASE
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass
+
+import content_database
+from helper.config_operations import get_library_path
+from helper.file_operations import create_database_folder, create_logger
+
+SNAPSHOT_FORMAT = "dazcontentinstaller-snapshot"
+SNAPSHOT_VERSION = 1
+BACKUP_PAGES_PER_STEP = 4096
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SnapshotReport:
+    archives: int = 0
+    files: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+
+def backup_database(destination: str, source: str | None = None) -> None:
+    """
+    Copy the database with SQLite's online backup API.
+
+    The copy is made in steps so other connections can keep writing while it
+    runs. The result is a consistent snapshot of the database.
+    """
+    with content_database.connect_database(source) as source_conn:
+        destination_conn = sqlite3.connect(destination)
+        try:
+            source_conn.backup(
+                destination_conn, pages=BACKUP_PAGES_PER_STEP, sleep=0.01
+            )
+        finally:
+            destination_conn.close()
+    logger.info(f"Backed up the database to {destination}")
+
+
+def _iter_manifests(conn: sqlite3.Connection):
+    """
+    Stream every archive with its files, ordered by archive id.
+
+    Yields:
+        tuple[str, list[str]]: The archive name and the paths of its files.
+    """
+    archives = conn.execute("SELECT id, archive_name FROM archives ORDER BY id")
+    files = conn.execute(
+        """
+        SELECT files.archive_id, directories.path, files.leaf_name FROM files
+        JOIN directories ON directories.id = files.directory_id
+        ORDER BY files.archive_id
+        """
+    )
+    pending = files.fetchone()
+    for archive_id, archive_name in archives:
+        manifest = []
+        while pending is not None and pending[0] <= archive_id:
+            if pending[0] == archive_id:
+                manifest.append(os.path.join(pending[1], pending[2]))
+            pending = files.fetchone()
+        yield archive_name, manifest
+
+
+def export_snapshot(snapshot_path: str, source: str | None = None) -> SnapshotReport:
+    """
+    Write every archive and its files to a gzip compressed JSON lines file.
+
+    A hot backup of the database is taken first and the snapshot is streamed
+    from it, so the app can keep installing while the export runs. File paths
+    are written relative to the library with forward slashes.
+    """
+    start = time.perf_counter()
+    report = SnapshotReport()
+    snapshot_folder = os.path.dirname(os.path.abspath(snapshot_path))
+    handle, backup_path = tempfile.mkstemp(suffix=".db", dir=snapshot_folder)
+    os.close(handle)
+    try:
+        backup_database(backup_path, source)
+        conn = sqlite3.connect(backup_path)
+        try:
+            schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            with gzip.open(snapshot_path, "wt", encoding="utf-8") as snapshot:
+                header = {
+                    "format": SNAPSHOT_FORMAT,
+                    "version": SNAPSHOT_VERSION,
+                    "schema_version": schema_version,
+                    "library_path": get_library_path(),
+                    "exported_at": time.time(),
+                }
+                snapshot.write(json.dumps(header) + "\n")
+                for archive_name, files in _iter_manifests(conn):
+                    record = {
+                        "archive": archive_name,
+                        "files": [path.replace(os.sep, "/") for path in files],
+                    }
+                    snapshot.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    report.archives += 1
+                    report.files += len(files)
+        finally:
+            conn.close()
+    finally:
+        os.remove(backup_path)
+
+    report.elapsed = time.perf_counter() - start
+    logger.info(
+        f"Exported {report.archives} archives with {report.files} files "
+        f"to {snapshot_path} in {report.elapsed:.1f}s"
+    )
+    return report
+
+
+def _import_batch(batch: list[tuple[str, list[str]]], report: SnapshotReport) -> None:
+    """Add the archives of a batch that are not in the database yet."""
+    existing = content_database.get_existing_archive_names(
+        [archive_name for archive_name, _ in batch]
+    )
+    new_archives = [
+        (archive_name, files)
+        for archive_name, files in batch
+        if archive_name not in existing
+    ]
+    if new_archives:
+        content_database.add_archives(new_archives)
+    report.skipped += len(batch) - len(new_archives)
+    report.archives += len(new_archives)
+    report.files += sum(len(files) for _, files in new_archives)
+
+
+def import_snapshot(snapshot_path: str, batch_size: int = 50000) -> SnapshotReport:
+    """
+    Add the archives of a snapshot to the database.
+
+    The snapshot is read line by line and written in transactions of about
+    batch_size files, so large snapshots never have to fit in memory and the
+    database is only locked briefly at a time. Archives that already exist
+    are skipped.
+
+    Raises:
+        ValueError: If the file is not a snapshot or was written by a newer version.
+    """
+    start = time.perf_counter()
+    report = SnapshotReport()
+    with gzip.open(snapshot_path, "rt", encoding="utf-8") as snapshot:
+        header = json.loads(snapshot.readline() or "{}")
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{snapshot_path} is not a database snapshot")
+        if header.get("version", 0) > SNAPSHOT_VERSION:
+            raise ValueError(f"{snapshot_path} was written by a newer version")
+
+        seen = set()
+        batch = []
+        batch_files = 0
+        for line in snapshot:
+            record = json.loads(line)
+            archive_name = record["archive"]
+            if archive_name in seen:
+                report.skipped += 1
+                continue
+            seen.add(archive_name)
+            files = [os.path.normpath(file_name) for file_name in record["files"]]
+            batch.append((archive_name, files))
+            batch_files += len(files)
+            if batch_files >= batch_size:
+                _import_batch(batch, report)
+                batch = []
+                batch_files = 0
+        if batch:
+            _import_batch(batch, report)
+
+    # The stored directory states belong to the old library, the next
+    # verification has to look at every directory again
+    with content_database.connect_database() as conn:
+        content_database.set_directory_states(conn, {})
+
+    report.elapsed = time.perf_counter() - start
+    logger.info(
+        f"Imported {report.archives} archives with {report.files} files "
+        f"from {snapshot_path} in {report.elapsed:.1f}s, skipped {report.skipped}"
+    )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="write a snapshot")
+    export_parser.add_argument("snapshot")
+    import_parser = subparsers.add_parser("import", help="read a snapshot")
+    import_parser.add_argument("snapshot")
+    import_parser.add_argument("--batch-size", type=int, default=50000)
+    backup_parser = subparsers.add_parser("backup", help="copy the SQLite database")
+    backup_parser.add_argument("database")
+    args = parser.parse_args()
+
+    create_logger()
+    create_database_folder()
+    if args.command == "backup":
+        backup_database(args.database)
+        print(f"Backed up the database to {args.database}")
+        return
+
+    if args.command == "export":
+        report = export_snapshot(args.snapshot)
+        print(f"Exported {report.archives} archives with {report.files} files")
+    else:
+        report = import_snapshot(args.snapshot, args.batch_size)
+        print(f"Imported {report.archives} archives with {report.files} files")
+        print(f"Skipped (already in the database): {report.skipped}")
+    elapsed = max(report.elapsed, 0.001)
+    print(f"Took {report.elapsed:.1f}s ({report.files / elapsed:.0f} files/s)")
+
+
+if __name__ == "__main__":
+    main()
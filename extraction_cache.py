@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import pathlib
+import shutil
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+
+from helper.config_operations import get_extraction_cache_size
+
+logger = logging.getLogger(__name__)
+
+# Extracted archives are kept here, next to the temporary folder so a finished
+# extraction can be moved in with a rename
+CACHE_FOLDER = pathlib.Path("cache")
+# Every entry folder holds its metadata next to the extracted files
+ENTRY_FILE = "entry.json"
+FILES_FOLDER = "files"
+# Bytes read from the start and the end of an archive for its fingerprint
+FINGERPRINT_CHUNK_SIZE = 1024 * 1024
+
+lock = threading.Lock()
+# Number of running installs using each entry, these are never evicted
+_entries_in_use = Counter()
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    folder: pathlib.Path
+    content_roots: list[pathlib.Path]
+    size: int
+
+
+def get_max_size() -> int:
+    """Return the configured cache size in bytes, 0 disables the cache."""
+    return int(get_extraction_cache_size() * 1024**3)
+
+
+def get_fingerprint(file_path: pathlib.Path) -> str:
+    """
+    Identify an archive by its size and the bytes at its start and end.
+
+    Archive formats keep their headers and central directories there, so this
+    tells archives apart without reading files of several GB in full. Renamed
+    or moved archives keep their fingerprint.
+    """
+    size = file_path.stat().st_size
+    digest = hashlib.sha256(str(size).encode())
+    with open(file_path, "rb") as file:
+        digest.update(file.read(FINGERPRINT_CHUNK_SIZE))
+        if size > FINGERPRINT_CHUNK_SIZE:
+            file.seek(max(size - FINGERPRINT_CHUNK_SIZE, FINGERPRINT_CHUNK_SIZE))
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def _read_entry(folder: pathlib.Path) -> dict | None:
+    try:
+        return json.loads((folder / ENTRY_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_entry(folder: pathlib.Path, entry: dict) -> None:
+    (folder / ENTRY_FILE).write_text(json.dumps(entry), encoding="utf-8")
+
+
+def open_entry(key: str) -> CacheEntry | None:
+    """
+    Return the cached extraction of an archive and mark it as used.
+
+    The entry stays in the cache until release_entry is called.
+    """
+    folder = CACHE_FOLDER / key
+    with lock:
+        entry = _read_entry(folder)
+        if entry is None:
+            return None
+        entry["last_used"] = time.time()
+        _write_entry(folder, entry)
+        _entries_in_use[key] += 1
+    logger.info(f"Using cached extraction of {entry['archive']}")
+    return CacheEntry(
+        key,
+        folder,
+        [folder / FILES_FOLDER / root for root in entry["content_roots"]],
+        entry["size"],
+    )
+
+
+def store_entry(
+    key: str,
+    file_path: pathlib.Path,
+    job_folder: pathlib.Path,
+    content_roots: list[pathlib.Path],
+    size: int,
+) -> CacheEntry | None:
+    """
+    Move an extracted job folder into the cache and mark it as used.
+
+    Least recently used entries are removed until the cache fits its size
+    limit again. Nothing is stored if the extraction alone is larger than
+    the limit or another install stored the same archive first.
+
+    Returns:
+        CacheEntry | None: The stored entry with the content roots moved along.
+    """
+    max_size = get_max_size()
+    if size > max_size:
+        return None
+
+    entry = {
+        "archive": str(file_path),
+        "size": size,
+        "content_roots": [
+            content_root.relative_to(job_folder).as_posix()
+            for content_root in content_roots
+        ],
+        "last_used": time.time(),
+    }
+    folder = CACHE_FOLDER / key
+    staging_folder = CACHE_FOLDER / f"staging-{uuid.uuid4().hex}"
+    staging_folder.mkdir(parents=True)
+    _write_entry(staging_folder, entry)
+    with lock:
+        try:
+            job_folder.rename(staging_folder / FILES_FOLDER)
+        except OSError:
+            shutil.rmtree(staging_folder, ignore_errors=True)
+            return None
+        try:
+            staging_folder.rename(folder)
+        except OSError:
+            # Another install stored the same archive first
+            (staging_folder / FILES_FOLDER).rename(job_folder)
+            shutil.rmtree(staging_folder, ignore_errors=True)
+            return None
+        _entries_in_use[key] += 1
+        evicted = _evict(max_size)
+
+    for evicted_folder in evicted:
+        shutil.rmtree(evicted_folder, ignore_errors=True)
+    logger.info(f"Cached extraction of {file_path}")
+    return CacheEntry(
+        key,
+        folder,
+        [folder / FILES_FOLDER / root for root in entry["content_roots"]],
+        entry["size"],
+    )
+
+
+def release_entry(cache_entry: CacheEntry) -> None:
+    with lock:
+        _entries_in_use[cache_entry.key] -= 1
+        if _entries_in_use[cache_entry.key] <= 0:
+            del _entries_in_use[cache_entry.key]
+
+
+def _evict(max_size: int) -> list[pathlib.Path]:
+    """
+    Take least recently used entries out of the cache until it fits max_size.
+
+    Has to be called with the lock held. The entries are renamed so they are
+    no longer found and their folders are returned to be deleted without the lock.
+    """
+    entries = []
+    for folder in CACHE_FOLDER.iterdir():
+        if folder.name.startswith(("evicted-", "staging-")):
+            continue
+        entry = _read_entry(folder)
+        if entry is not None:
+            entries.append((entry["last_used"], entry["size"], folder))
+    total_size = sum(size for _, size, _ in entries)
+
+    evicted = []
+    for _, size, folder in sorted(entries):
+        if total_size <= max_size:
+            break
+        if folder.name in _entries_in_use:
+            continue
+        evicted_folder = folder.with_name(f"evicted-{uuid.uuid4().hex}")
+        try:
+            folder.rename(evicted_folder)
+        except OSError as e:
+            logger.warning(f"Could not remove cached extraction {folder}: {e}")
+            continue
+        evicted.append(evicted_folder)
+        total_size -= size
+    return evicted
+
+
+def clean_evicted_entries() -> None:
+    """Remove entries that were interrupted by closing the app while being moved."""
+    if not CACHE_FOLDER.exists():
+        return
+    for folder in CACHE_FOLDER.iterdir():
+        if folder.name.startswith(("evicted-", "staging-")):
+            shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,322 @@
+import os
+import re
+import tarfile
+from dataclasses import dataclass
+from pathlib import Path, PurePath
+
+from helper.cancellation import CancellationToken
+
+# Bytes read from the start of a file to recognize its format, tar keeps its
+# magic at offset 257
+SNIFF_SIZE = 512
+
+SEVEN_ZIP_BACKEND = "7z"
+TAR_BACKEND = "tar"
+
+
+@dataclass(frozen=True)
+class ArchiveFormat:
+    name: str
+    # Lowercase file name endings, compound ones like .tar.gz included
+    extensions: tuple[str, ...]
+    # (offset, bytes) pairs of which one has to match
+    signatures: tuple[tuple[int, bytes], ...]
+    backend: str
+
+
+FORMATS = [
+    ArchiveFormat(
+        "zip",
+        (".zip",),
+        ((0, b"PK\x03\x04"), (0, b"PK\x05\x06"), (0, b"PK\x07\x08")),
+        SEVEN_ZIP_BACKEND,
+    ),
+    ArchiveFormat("rar", (".rar",), ((0, b"Rar!\x1a\x07"),), SEVEN_ZIP_BACKEND),
+    ArchiveFormat("7z", (".7z",), ((0, b"7z\xbc\xaf\x27\x1c"),), SEVEN_ZIP_BACKEND),
+    ArchiveFormat("tar", (".tar",), ((257, b"ustar"),), SEVEN_ZIP_BACKEND),
+    # 7-Zip only unpacks the inner tar of compressed tars and needs a second
+    # pass, tarfile streams them in one
+    ArchiveFormat("tar.gz", (".tar.gz", ".tgz"), ((0, b"\x1f\x8b"),), TAR_BACKEND),
+    ArchiveFormat(
+        "tar.bz2", (".tar.bz2", ".tbz2", ".tbz"), ((0, b"BZh"),), TAR_BACKEND
+    ),
+    ArchiveFormat("tar.xz", (".tar.xz", ".txz"), ((0, b"\xfd7zXZ\x00"),), TAR_BACKEND),
+]
+
+# Volumes of multi-part archives with the archive extension they belong to,
+# None takes it from the name. Numbered volumes start at 1, old style .r00
+# and .z01 volumes follow the .rar or .zip of the same name instead.
+VOLUME_PATTERNS = [
+    (re.compile(r"^(?P<base>.+)\.part(?P<number>\d+)\.rar$", re.I), ".rar", True),
+    (
+        re.compile(r"^(?P<base>.+)\.(?P<ext>7z|zip|rar|tar)\.(?P<number>\d{3})$", re.I),
+        None,
+        True,
+    ),
+    (re.compile(r"^(?P<base>.+)\.r(?P<number>\d{2})$", re.I), ".rar", False),
+    (re.compile(r"^(?P<base>.+)\.z(?P<number>\d{2})$", re.I), ".zip", False),
+]
+
+_backends = {}
+
+
+def register_format(archive_format: ArchiveFormat) -> None:
+    """Adds a format, formats registered later win over earlier ones."""
+    FORMATS.insert(0, archive_format)
+
+
+def register_backend(name: str, extract, list_members) -> None:
+    """
+    Adds a backend that formats can be sent to.
+
+    Args:
+        name (str): The name formats refer to in their backend field.
+        extract: Called with the archive path, the output folder, a
+            cancellation token and the debug flag.
+        list_members: Called with the archive path and a cancellation token,
+            returns (path, size) for every file in the archive.
+    """
+    _backends[name] = (extract, list_members)
+
+
+def _match_extension(file_name: str) -> tuple[ArchiveFormat, str] | None:
+    """Return the format with the longest extension the name ends with."""
+    lower_name = file_name.lower()
+    matches = [
+        (archive_format, extension)
+        for archive_format in FORMATS
+        for extension in archive_format.extensions
+        if lower_name.endswith(extension)
+    ]
+    if not matches:
+        return None
+    return max(matches, key=lambda match: len(match[1]))
+
+
+def split_volume_name(file_name: str) -> tuple[str, str, bool] | None:
+    """
+    Recognize a volume of a multi-part archive by its name.
+
+    Returns:
+        tuple[str, str, bool] | None: The name without volume and archive
+        extension, the archive extension and whether it is the first volume.
+        None if the name is no volume.
+    """
+    for pattern, extension, is_numbered in VOLUME_PATTERNS:
+        match = pattern.match(file_name)
+        if match:
+            extension = extension or f".{match['ext'].lower()}"
+            is_first = is_numbered and int(match["number"]) == 1
+            return match["base"], extension, is_first
+    return None
+
+
+def get_base_name(file_name: str) -> str:
+    """
+    Return a file name without its volume and archive extensions.
+
+    Only known extensions are removed, so dots inside a product name are kept.
+    """
+    volume = split_volume_name(file_name)
+    if volume is not None:
+        return volume[0]
+    match = _match_extension(file_name)
+    if match is not None:
+        return file_name[: -len(match[1])]
+    return PurePath(file_name).stem
+
+
+def is_archive_name(file_name: str) -> bool:
+    """Check by name alone whether a file is an archive or one of its volumes."""
+    return _match_extension(file_name) is not None or (
+        split_volume_name(file_name) is not None
+    )
+
+
+def _is_compressed_tar(file_path) -> bool:
+    """Check that a compressed file starts with a valid tar header."""
+    try:
+        with tarfile.open(file_path, "r|*") as archive:
+            return archive.next() is not None
+    except (tarfile.TarError, OSError, EOFError):
+        return False
+
+
+def sniff_format(file_path) -> ArchiveFormat | None:
+    """
+    Recognize the format of a file from its first bytes.
+
+    Compressed tars only have the signature of their compression, which gzip
+    also puts in front of single compressed files like content saved by DAZ
+    Studio. Their first tar header is read to tell them apart.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            header = file.read(SNIFF_SIZE)
+    except OSError:
+        return None
+    for archive_format in FORMATS:
+        for offset, signature in archive_format.signatures:
+            if header[offset : offset + len(signature)] == signature:
+                if archive_format.backend == TAR_BACKEND and not _is_compressed_tar(
+                    file_path
+                ):
+                    return None
+                return archive_format
+    return None
+
+
+def detect_format(file_path) -> ArchiveFormat | None:
+    """
+    Return the format of an archive, trusting its content over its name.
+
+    Archives with a wrong extension are sent to the backend that can read
+    them. If the content is not recognized, for example in later volumes or
+    self-extracting archives, the name decides.
+    """
+    sniffed_format = sniff_format(file_path)
+    if sniffed_format is not None:
+        return sniffed_format
+    volume = split_volume_name(PurePath(file_path).name)
+    if volume is not None:
+        return _match_extension(volume[1])[0]
+    match = _match_extension(PurePath(file_path).name)
+    return match[0] if match else None
+
+
+def _get_volume_key(file_path: Path) -> tuple[str, str, str, bool] | None:
+    volume = split_volume_name(file_path.name)
+    if volume is not None:
+        base_name, extension, is_first = volume
+        return str(file_path.parent).lower(), base_name.lower(), extension, is_first
+    match = _match_extension(file_path.name)
+    if match is not None:
+        base_name = file_path.name[: -len(match[1])]
+        return str(file_path.parent).lower(), base_name.lower(), match[1], True
+    return None
+
+
+def group_volumes(file_paths: list) -> tuple[dict[Path, list[Path]], list[Path]]:
+    """
+    Group archive files so each multi-part archive becomes one logical archive.
+
+    Returns:
+        tuple[dict[Path, list[Path]], list[Path]]: Every first volume or single
+        archive with all of its volumes, and the volumes whose first volume
+        is not among the files.
+    """
+    groups = {}
+    for file_path in map(Path, file_paths):
+        key = _get_volume_key(file_path)
+        if key is None:
+            continue
+        first_volumes, volumes = groups.setdefault(key[:3], ([], []))
+        (first_volumes if key[3] else volumes).append(file_path)
+
+    archives = {}
+    incomplete = []
+    for first_volumes, volumes in groups.values():
+        if not first_volumes:
+            incomplete.extend(volumes)
+            continue
+        archives[first_volumes[0]] = [*first_volumes, *sorted(volumes)]
+    return archives, incomplete
+
+
+def find_volumes(archive_path) -> list[Path]:
+    """Return every volume of the archive, just the archive if it has no others."""
+    archive_path = Path(archive_path)
+    if _get_volume_key(archive_path) is None:
+        return [archive_path]
+    try:
+        siblings = [
+            archive_path.parent / name for name in os.listdir(archive_path.parent)
+        ]
+    except OSError:
+        return [archive_path]
+    archives, _ = group_volumes(siblings)
+    for volumes in archives.values():
+        if archive_path in volumes:
+            return volumes
+    return [archive_path]
+
+
+def _get_backend(archive_path: Path):
+    from helper.extractor import ExtractionError
+
+    archive_format = detect_format(archive_path)
+    if archive_format is None:
+        raise ExtractionError(f"{archive_path.name} is not a supported archive")
+    return _backends[archive_format.backend]
+
+
+def extract(
+    archive_path: Path,
+    output_folder: Path,
+    token: CancellationToken | None = None,
+    is_debug_mode: bool = False,
+) -> None:
+    """
+    Extract an archive with the backend of its format.
+
+    Raises:
+        ExtractionError: If the format is not supported or extraction fails.
+    """
+    extract_function, _ = _get_backend(archive_path)
+    extract_function(archive_path, output_folder, token, is_debug_mode)
+
+
+def list_archive(
+    archive_path: Path, token: CancellationToken | None = None
+) -> list[tuple[str, int]]:
+    """List the files of an archive with the backend of its format."""
+    _, list_function = _get_backend(archive_path)
+    return list_function(archive_path, token)
+
+
+def _extract_with_seven_zip(archive_path, output_folder, token, is_debug_mode):
+    from helper import extractor
+
+    extractor.extract(archive_path, output_folder, token, is_debug_mode)
+
+
+def _list_with_seven_zip(archive_path, token):
+    from helper import extractor
+
+    return extractor.list_archive(archive_path, token)
+
+
+def _extract_tar(archive_path, output_folder, token, is_debug_mode):
+    """Unpack a compressed tar in a single streaming pass."""
+    from helper.extractor import ExtractionError
+
+    token = token or CancellationToken()
+    output_folder.mkdir(parents=True, exist_ok=True)
+    try:
+        with tarfile.open(archive_path, "r|*") as archive:
+            for member in archive:
+                token.raise_if_cancelled()
+                # The data filter rejects absolute paths, links and devices
+                archive.extract(member, output_folder, filter="data")
+    except (tarfile.TarError, OSError, EOFError) as e:
+        raise ExtractionError(str(e)) from e
+
+
+def _list_tar(archive_path, token):
+    from helper.extractor import ExtractionError
+
+    token = token or CancellationToken()
+    members = []
+    try:
+        with tarfile.open(archive_path, "r|*") as archive:
+            for member in archive:
+                token.raise_if_cancelled()
+                if member.isfile():
+                    members.append((member.name, member.size))
+    except (tarfile.TarError, OSError, EOFError) as e:
+        raise ExtractionError(str(e)) from e
+    return members
+
+
+register_backend(SEVEN_ZIP_BACKEND, _extract_with_seven_zip, _list_with_seven_zip)
+register_backend(TAR_BACKEND, _extract_tar, _list_tar)
@@ -0,0 +1,66 @@
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+
+
+class InstallCancelled(Exception):
+    """Raised when an installation is cancelled or one of its phases timed out."""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation for a single installation.
+
+    Long-running steps call raise_if_cancelled between units of work.
+    Subprocesses registered with the token are killed as soon as it is
+    cancelled. A phase can set a deadline after which the token cancels itself.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes = set()
+        self.reason = ""
+        self.phase_name = ""
+        self.deadline = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "Installation cancelled") -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            processes = list(self._processes)
+        for process in processes:
+            process.kill()
+
+    def raise_if_cancelled(self) -> None:
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.cancel(f"The {self.phase_name} phase timed out")
+        if self._event.is_set():
+            raise InstallCancelled(self.reason)
+
+    @contextmanager
+    def phase(self, name: str, timeout: float = 0):
+        """Runs a phase with an optional timeout in seconds, 0 disables it."""
+        self.phase_name = name
+        self.deadline = time.monotonic() + timeout if timeout > 0 else None
+        try:
+            yield self
+        finally:
+            self.deadline = None
+
+    def register_process(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.add(process)
+        if self._event.is_set():
+            process.kill()
+
+    def unregister_process(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.discard(process)
@@ -1,5 +1,13 @@
 import configparser
 
+# MB/s and files/s of each I/O profile and install phase if config.ini sets none
+DEFAULT_IO_LIMITS = {
+    ("fast", "extract"): (0, 0),
+    ("fast", "copy"): (0, 0),
+    ("background", "extract"): (40, 0),
+    ("background", "copy"): (40, 400),
+}
+
 
 def get_library_path():
     config = _get_config_file()
@@ -11,6 +19,59 @@ def get_debug_mode():
     return config["DEBUG"].getboolean("DebugMode")
 
 
+def get_scheduling_policy():
+    config = _get_config_file()
+    return config.get("INSTALL", "SchedulingPolicy", fallback="fifo").lower()
+
+
+def get_extraction_workers():
+    config = _get_config_file()
+    return max(config.getint("INSTALL", "ExtractionWorkers", fallback=2), 1)
+
+
+def get_copy_workers():
+    config = _get_config_file()
+    return max(config.getint("INSTALL", "CopyWorkers", fallback=1), 1)
+
+
+def get_extraction_timeout():
+    config = _get_config_file()
+    return config.getint("INSTALL", "ExtractionTimeout", fallback=3600)
+
+
+def get_copy_timeout():
+    config = _get_config_file()
+    return config.getint("INSTALL", "CopyTimeout", fallback=3600)
+
+
+def get_process_workers():
+    config = _get_config_file()
+    return max(config.getint("INSTALL", "ProcessWorkers", fallback=0), 0)
+
+
+def get_extraction_cache_size():
+    config = _get_config_file()
+    return max(config.getfloat("INSTALL", "ExtractionCacheSize", fallback=0), 0)
+
+
+def get_io_profile():
+    config = _get_config_file()
+    return config.get("IO", "Profile", fallback="fast").lower()
+
+
+def get_io_limits(profile, phase):
+    config = _get_config_file()
+    default_bytes, default_files = DEFAULT_IO_LIMITS.get((profile, phase), (0, 0))
+    prefix = f"{profile.capitalize()}{phase.capitalize()}"
+    megabytes_per_second = config.getfloat(
+        "IO", f"{prefix}MBps", fallback=default_bytes
+    )
+    files_per_second = config.getfloat(
+        "IO", f"{prefix}FilesPerSecond", fallback=default_files
+    )
+    return max(megabytes_per_second, 0), max(files_per_second, 0)
+
+
 def _get_config_file():
     config = configparser.ConfigParser()
     config.read("config.ini")
@@ -0,0 +1,109 @@
+import logging
+import subprocess
+from pathlib import Path
+
+from helper.cancellation import CancellationToken, InstallCancelled
+from helper.io_governor import governor
+
+logger = logging.getLogger(__name__)
+
+# Path to the 7z executable
+SEVEN_ZIP_PATH = str(Path(__file__).parent.parent.absolute() / "7z") + "\\7z.exe"
+
+# Seconds between cancellation checks while 7-Zip is running
+POLL_INTERVAL = 0.2
+
+
+class ExtractionError(Exception):
+    """Raised when 7-Zip fails to process an archive."""
+
+
+def run_seven_zip(arguments: list[str], token: CancellationToken | None = None) -> str:
+    """
+    Run 7-Zip and wait for it while watching the cancellation token.
+
+    7-Zip never prompts: standard input is closed and a dummy password is
+    passed, so encrypted archives fail instead of waiting for input. The
+    process is killed as soon as the token is cancelled or its phase times out.
+    With the background I/O profile 7-Zip runs at below normal priority.
+
+    Returns:
+        str: The standard output of 7-Zip.
+    """
+    token = token or CancellationToken()
+    token.raise_if_cancelled()
+    creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+    if governor.is_background:
+        creationflags |= getattr(subprocess, "BELOW_NORMAL_PRIORITY_CLASS", 0)
+    process = subprocess.Popen(
+        [SEVEN_ZIP_PATH, *arguments, "-p-", "-y"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        creationflags=creationflags,
+    )
+    token.register_process(process)
+    try:
+        while True:
+            try:
+                stdout, stderr = process.communicate(timeout=POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                try:
+                    token.raise_if_cancelled()
+                except InstallCancelled:
+                    process.kill()
+                    process.communicate()
+                    raise
+    finally:
+        token.unregister_process(process)
+
+    token.raise_if_cancelled()
+    if process.returncode != 0:
+        message = stderr.strip() or f"7-Zip exited with code {process.returncode}"
+        raise ExtractionError(message)
+    return stdout
+
+
+def extract(
+    archive_path: Path,
+    output_folder: Path,
+    token: CancellationToken | None = None,
+    is_debug_mode: bool = False,
+) -> None:
+    """Extract an archive into output_folder with 7-Zip."""
+    output_folder.mkdir(parents=True, exist_ok=True)
+    output = run_seven_zip(["x", str(archive_path), f"-o{output_folder}"], token)
+    if is_debug_mode:
+        logger.info(output)
+
+
+def list_archive(
+    archive_path: Path, token: CancellationToken | None = None
+) -> list[tuple[str, int]]:
+    """
+    List the files of an archive without extracting it.
+
+    Returns:
+        list[tuple[str, int]]: The path of every file inside the archive with its
+        uncompressed size in bytes. Folders are left out.
+    """
+    # 7-Zip writes the OEM code page by default, which turns names outside of
+    # it into replacement characters
+    output = run_seven_zip(["l", "-slt", "-sccUTF-8", str(archive_path)], token)
+    # The technical listing starts after a dashed line with one block per entry
+    _, _, entries = output.partition("\n----------")
+    members = []
+    for block in entries.split("\n\n"):
+        properties = dict(
+            line.split(" = ", 1) for line in block.splitlines() if " = " in line
+        )
+        if "Path" not in properties or properties.get("Folder") == "+":
+            continue
+        if properties.get("Attributes", "").startswith("D"):
+            continue
+        members.append((properties["Path"], int(properties.get("Size") or 0)))
+    return members
@@ -1,9 +1,14 @@
 import logging
+import os
 import shutil
+import sys
 
-from datetime import datetime
 from pathlib import Path, PurePath
 
+from helper import archive_formats
+from helper.config_operations import get_debug_mode
+from helper.log_pipeline import start_logging
+
 
 def get_file_from_path(file_path):
     return PurePath(file_path).name
@@ -53,14 +58,163 @@ def delete_temp_folder() -> None:
         shutil.rmtree(temp_path)
 
 
+def get_archive_name(file_path) -> str:
+    """
+    Returns the name an archive is stored under in the database.
+
+    Archive and volume extensions like .tar.gz or .part1.rar are removed, dots
+    that are part of the product name are kept.
+    """
+    return archive_formats.get_base_name(PurePath(file_path).name)
+
+
+def get_archive_names(file_path) -> list[str]:
+    """
+    Returns every name an archive may be stored under in the database.
+
+    Archives used to be stored under their name up to the first dot, which
+    is kept as a second name so they are still found as installed.
+    """
+    archive_name = get_archive_name(file_path)
+    legacy_name = PurePath(file_path).stem.split(".")[0]
+    if legacy_name and legacy_name != archive_name:
+        return [archive_name, legacy_name]
+    return [archive_name]
+
+
 def get_file_size(file_path):
     file = Path(file_path)
     if not file.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
-    return _convert_size(file.stat().st_size)
+    return convert_size(file.stat().st_size)
 
 
-def _convert_size(size_bytes: int) -> str:
+def _group_archive_files(
+    files: list[tuple[str, int]],
+) -> tuple[list[tuple[str, int]], list[str]]:
+    """
+    Turns the volumes of multi-part archives into one archive each.
+
+    Returns:
+        tuple[list[tuple[str, int]], list[str]]: The first volume of every
+        archive with the size of all its volumes, and the volumes whose first
+        volume is missing.
+    """
+    sizes = {Path(path): size for path, size in files}
+    groups, incomplete = archive_formats.group_volumes(sizes)
+    archives = [
+        (str(first_volume), sum(sizes[volume] for volume in volumes))
+        for first_volume, volumes in groups.items()
+    ]
+    # Files without an archive name were recognized by their content
+    grouped = {volume for volumes in groups.values() for volume in volumes}
+    archives.extend(
+        (str(path), size)
+        for path, size in sizes.items()
+        if path not in grouped and path not in incomplete
+    )
+    return archives, [str(path) for path in incomplete]
+
+
+def _is_unnamed_archive(file_path: str, is_any_suffix: bool = False) -> bool:
+    """
+    Checks the content of files without an archive extension.
+
+    Files in scanned folders are only checked without any extension, like
+    browser downloads, so previews and textures are not opened one by one.
+    With is_any_suffix files like "product.download" are checked too.
+    """
+    if not is_any_suffix and PurePath(file_path).suffix:
+        return False
+    return archive_formats.sniff_format(file_path) is not None
+
+
+def scan_archives(paths: list[str], batch_size: int = 100):
+    """
+    Expands files and folders into the archives they contain.
+
+    Folders are searched recursively with os.scandir, which reuses the stat
+    information of the directory listing where the platform provides it. The
+    volumes of a multi-part archive are yielded as its first volume. Other
+    files found in folders, like previews and readmes, are skipped silently,
+    only files that were passed in are reported as non-archives.
+
+    Args:
+        paths (list[str]): Dropped or selected files and folders.
+        batch_size (int): The number of archives per yielded batch.
+
+    Yields:
+        tuple[list[tuple[str, int]], list[str]]: A batch of archive paths with
+        their sizes in bytes and the paths that were rejected, either passed in
+        non-archives or volumes of a multi-part archive without its first volume.
+    """
+    files = []
+    rejected = []
+    pending = []
+
+    for path in paths:
+        try:
+            if os.path.isdir(path):
+                pending.append(path)
+            elif is_file_archive(path) or _is_unnamed_archive(path, True):
+                files.append((path, os.stat(path).st_size))
+            else:
+                rejected.append(path)
+        except OSError:
+            rejected.append(path)
+    archives, incomplete = _group_archive_files(files)
+    rejected.extend(incomplete)
+
+    while pending or archives or rejected:
+        if len(archives) >= batch_size or not pending:
+            yield archives[:batch_size], rejected
+            archives = archives[batch_size:]
+            rejected = []
+            continue
+
+        files = []
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif is_file_archive(entry.name) or _is_unnamed_archive(
+                        entry.path
+                    ):
+                        files.append((entry.path, entry.stat().st_size))
+        except OSError as e:
+            logging.getLogger(__name__).warning(f"Could not scan folder: {e}")
+        # Volumes are grouped per folder, a multi-part archive never spans two
+        folder_archives, incomplete = _group_archive_files(files)
+        archives.extend(folder_archives)
+        rejected.extend(incomplete)
+
+
+def list_relative_files(folder_path: str, root_path: str) -> list[str]:
+    """
+    Lists every file below a folder with os.scandir.
+
+    Args:
+        folder_path (str): The folder to walk.
+        root_path (str): The folder the returned paths are relative to.
+
+    Returns:
+        list[str]: The paths of the files relative to root_path.
+    """
+    prefix_length = len(os.path.join(root_path, ""))
+    files = []
+    pending = [folder_path]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    files.append(entry.path[prefix_length:])
+    return files
+
+
+def convert_size(size_bytes: int) -> str:
     """
     Converts a file size in bytes to a human-readable format.
 
@@ -82,40 +236,26 @@ def _convert_size(size_bytes: int) -> str:
     return f"{size_bytes:.2f} {size_units[i]}"
 
 
-def limit_logger_files() -> None:
-    """
-    Deletes the oldest log files when the number of log files exceeds the limit.
-    """
-    log_dir = Path("logs/")
-
-    log_files = sorted(log_dir.iterdir(), key=lambda f: f.stat().st_ctime)
-
-    if len(log_files) > 3:
-        files_to_delete = len(log_files) - 3
-        for file in log_files[:files_to_delete]:
-            file.unlink()
-
-
 def create_logger() -> logging.Logger:
     """
-    Sets up the logging configuration and creates a new log file.
+    Sets up non-blocking logging to a rotating log file.
+
+    Every program writes its own file in logs/, named after its script, so the
+    GUI and the command line tools never rotate the same file. Debug mode
+    enables the debug level.
 
     Returns:
         logging.Logger: A configured logger instance.
     """
     create_log_folder()
-    limit_logger_files()
-    now = datetime.now().strftime("%d.%m.%Y %H-%M-%S")
-    log_file = Path("logs") / f"{now}.log"
-    logging.basicConfig(
-        filename=str(log_file),
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        datefmt="%m/%d/%Y %I:%M:%S",
-    )
+    script = sys.argv[0] if sys.argv else ""
+    program = Path(script).stem if script.endswith((".py", ".pyw", ".exe")) else "app"
+    log_file = Path("logs") / f"{program}.log"
+    level = logging.DEBUG if get_debug_mode() else logging.INFO
+    start_logging(str(log_file), level)
     return logging.getLogger(__name__)
 
 
 def is_file_archive(file):
-    if file.lower().endswith((".zip", ".rar", ".7z", ".tar")):
+    if archive_formats.is_archive_name(PurePath(file).name):
         return True
@@ -0,0 +1,132 @@
+import logging
+import shutil
+import threading
+import time
+
+from helper.cancellation import CancellationToken
+from helper.config_operations import get_io_limits, get_io_profile
+
+logger = logging.getLogger(__name__)
+
+FAST_PROFILE = "fast"
+BACKGROUND_PROFILE = "background"
+PROFILES = (FAST_PROFILE, BACKGROUND_PROFILE)
+PHASES = ("extract", "copy")
+
+# Size of the pieces a throttled copy is read and written in
+COPY_CHUNK_SIZE = 1024 * 1024
+# Longest sleep between cancellation checks while waiting for the limit
+MAX_WAIT_INTERVAL = 0.2
+
+
+class TokenBucket:
+    """
+    Limits how fast a quantity may be used, shared by every thread.
+
+    Each consumer takes what it needs right away and the bucket may go into
+    debt. The consumer then waits until the rate has paid the debt back, so
+    later consumers wait for earlier ones and the long-term rate never
+    exceeds the limit. A burst of up to one second is allowed after idle
+    periods. A rate of 0 means unlimited.
+    """
+
+    def __init__(self, rate: float = 0):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self.rate = rate
+            self._tokens = min(self._tokens, rate)
+            self._updated = time.monotonic()
+
+    def consume(self, amount: float, token: CancellationToken | None = None) -> None:
+        """Takes amount from the bucket and waits until the rate allows it."""
+        with self._lock:
+            if self.rate <= 0:
+                return
+            now = time.monotonic()
+            self._tokens = min(
+                self._tokens + (now - self._updated) * self.rate, self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+            ready_at = now + max(-self._tokens / self.rate, 0)
+
+        while (remaining := ready_at - time.monotonic()) > 0:
+            if token is not None:
+                token.raise_if_cancelled()
+            time.sleep(min(remaining, MAX_WAIT_INTERVAL))
+
+
+class IOGovernor:
+    """
+    Limits the bytes and files per second of each install phase.
+
+    The limits come from the active profile, which can be switched while
+    installs are running. The fast profile is unlimited unless configured
+    otherwise, the background profile leaves disk bandwidth for DAZ Studio.
+    """
+
+    def __init__(self, profile: str = FAST_PROFILE):
+        self._buckets = {phase: (TokenBucket(), TokenBucket()) for phase in PHASES}
+        self.profile = None
+        self.set_profile(profile)
+
+    @property
+    def is_background(self) -> bool:
+        return self.profile == BACKGROUND_PROFILE
+
+    def set_profile(self, profile: str) -> None:
+        if profile not in PROFILES:
+            logger.warning(f"Unknown I/O profile '{profile}', using {FAST_PROFILE}")
+            profile = FAST_PROFILE
+        for phase, (byte_bucket, file_bucket) in self._buckets.items():
+            megabytes_per_second, files_per_second = get_io_limits(profile, phase)
+            byte_bucket.set_rate(megabytes_per_second * 1024**2)
+            file_bucket.set_rate(files_per_second)
+        self.profile = profile
+        logger.info(f"Switched to the {profile} I/O profile")
+
+    def is_limited(self, phase: str) -> bool:
+        return any(bucket.rate > 0 for bucket in self._buckets[phase])
+
+    def throttle(
+        self,
+        phase: str,
+        byte_count: int,
+        file_count: int = 0,
+        token: CancellationToken | None = None,
+    ) -> None:
+        """Accounts for I/O of a phase and waits until it fits the limits."""
+        byte_bucket, file_bucket = self._buckets[phase]
+        if file_count:
+            file_bucket.consume(file_count, token)
+        if byte_count:
+            byte_bucket.consume(byte_count, token)
+
+    def copy_file(
+        self, source: str, destination: str, token: CancellationToken | None = None
+    ) -> None:
+        """
+        Copies a file like shutil.copy2 within the limits of the copy phase.
+
+        Without a limit the file is copied in one call so the fast copy of the
+        platform is used. Otherwise it is copied in chunks and the limit is
+        applied to each one, so large files do not burst past it.
+        """
+        if not self.is_limited("copy"):
+            shutil.copy2(source, destination)
+            return
+
+        self.throttle("copy", 0, 1, token)
+        with open(source, "rb") as source_file, open(destination, "wb") as target:
+            while chunk := source_file.read(COPY_CHUNK_SIZE):
+                self.throttle("copy", len(chunk), token=token)
+                target.write(chunk)
+        shutil.copystat(source, destination)
+
+
+governor = IOGovernor(get_io_profile())
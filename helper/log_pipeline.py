@@ -0,0 +1,84 @@
+import atexit
+import contextvars
+import gzip
+import logging
+import os
+import queue
+import shutil
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Size at which the log file is rotated and the number of compressed logs kept
+MAX_LOG_SIZE = 5 * 1024**2
+LOG_BACKUP_COUNT = 5
+LOG_FORMAT = "%(asctime)s - %(levelname)s - [%(job_id)s] %(message)s"
+
+# The install job the current thread works on, added to every log record
+job_id = contextvars.ContextVar("job_id", default="-")
+
+
+class JobContextFilter(logging.Filter):
+    """Stamps each record with the job id of the thread that logged it."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.job_id = job_id.get()
+        return True
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotates the log file by size and keeps the old logs gzip compressed.
+
+    Rotation runs on the listener thread, so compressing never blocks the
+    threads that log.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__(
+            filename,
+            maxBytes=MAX_LOG_SIZE,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self._compress
+
+    @staticmethod
+    def _compress(source: str, destination: str) -> None:
+        with open(source, "rb") as log_file, gzip.open(destination, "wb") as archive:
+            shutil.copyfileobj(log_file, archive)
+        os.remove(source)
+
+
+def submit_with_context(executor, function, *args):
+    """
+    Submits a function to an executor with a copy of the caller's context.
+
+    Threads of an executor do not inherit context variables, this keeps the
+    job id of records logged by helper threads.
+    """
+    return executor.submit(contextvars.copy_context().run, function, *args)
+
+
+def start_logging(log_file: str, level: int) -> QueueListener:
+    """
+    Sends every record through a queue to a rotating log file.
+
+    Logging only puts the record on a queue, the file is written by a
+    listener thread that is stopped and flushed when the process exits.
+    """
+    log_queue = queue.SimpleQueue()
+    file_handler = CompressingRotatingFileHandler(log_file)
+    file_handler.setFormatter(
+        logging.Formatter(LOG_FORMAT, datefmt="%m/%d/%Y %I:%M:%S")
+    )
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(JobContextFilter())
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,37 @@
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from helper.config_operations import get_process_workers
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process pool shared by CPU-bound work of the install engine.
+
+    The pool is created on first use and its worker processes are started as
+    tasks arrive, so nothing is spawned until the first large job. Functions
+    sent to it have to live in modules that are cheap to import, like helper.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = get_process_workers() or os.cpu_count() or 1
+            logger.info(f"Starting process pool with {workers} workers")
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    """Stops the worker processes, a later call to get_process_pool starts new ones."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,19 +1,53 @@
 import json
+import logging
+import time
 import urllib.request
 import webbrowser
+from pathlib import Path
 
 from packaging.version import Version
-from helper.file_operations import create_logger
 
 api_url = "https://api.github.com/repos/Ati1707/DazContentInstaller/releases/latest"
-logger = create_logger()
+logger = logging.getLogger(__name__)
 
+# The latest release tag is cached so the GitHub API is queried at most once a day
+UPDATE_CACHE_FILE = Path("database/update_check.json")
+UPDATE_CACHE_TTL = 24 * 60 * 60
+UPDATE_CHECK_TIMEOUT = 5
 
-def is_new_update_available(local_version):
+
+def _get_cached_version() -> str | None:
+    try:
+        cache = json.loads(UPDATE_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    if time.time() - cache.get("checked_at", 0) > UPDATE_CACHE_TTL:
+        return None
+    return cache.get("latest_version")
+
+
+def _set_cached_version(latest_version: str) -> None:
     try:
-        response = urllib.request.urlopen(api_url).read()
+        UPDATE_CACHE_FILE.write_text(
+            json.dumps({"latest_version": latest_version, "checked_at": time.time()})
+        )
+    except OSError as e:
+        logger.warning(f"Could not cache the update check. Reason: {e}")
+
+
+def get_latest_version(timeout: float = UPDATE_CHECK_TIMEOUT) -> str:
+    latest_version = _get_cached_version()
+    if latest_version is None:
+        response = urllib.request.urlopen(api_url, timeout=timeout).read()
         data = json.loads(response)
         latest_version = data["tag_name"].strip("v")
+        _set_cached_version(latest_version)
+    return latest_version
+
+
+def is_new_update_available(local_version):
+    try:
+        latest_version = get_latest_version()
         return Version(latest_version) > Version(local_version)
     except Exception as e:
         # Handle any HTTP or network-related errors here
@@ -0,0 +1,225 @@
+"""
+Plans installations from archive listings without extracting anything.
+
+Usage:
+    python install_planner.py ARCHIVE_OR_FOLDER [ARCHIVE_OR_FOLDER ...] [--workers 16]
+"""
+
+import argparse
+import logging
+import os
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import content_database
+import installer
+from helper import archive_formats, extractor
+from helper.config_operations import get_library_path
+from helper.file_operations import (
+    convert_size,
+    create_database_folder,
+    create_logger,
+    get_archive_name,
+    get_archive_names,
+    is_file_archive,
+    scan_archives,
+)
+
+logger = logging.getLogger(__name__)
+
+# Assumed bytes per second until the first installation has been measured
+DEFAULT_THROUGHPUT = 50 * 1024**2
+
+
+@dataclass
+class InstallPlan:
+    """What installing an archive would do to the library."""
+
+    archive_path: str
+    content_roots: list[str] = field(default_factory=list)
+    archive_names: list[str] = field(default_factory=list)
+    already_installed: list[str] = field(default_factory=list)
+    # Library paths of the files that would be installed
+    target_paths: list[str] = field(default_factory=list)
+    total_bytes: int = 0
+    conflicts: list[str] = field(default_factory=list)
+    # Nested archives can only be planned once they are extracted
+    nested_archives: list[str] = field(default_factory=list)
+    estimated_seconds: float = 0.0
+    error: str = ""
+
+    @property
+    def file_count(self) -> int:
+        return len(self.target_paths)
+
+    @property
+    def is_installable(self) -> bool:
+        return not self.error and (
+            len(self.already_installed) < len(self.archive_names)
+            or bool(self.nested_archives)
+        )
+
+    def describe(self) -> str:
+        """Returns a short human-readable report of the plan."""
+        name = pathlib.Path(self.archive_path).name
+        if self.error:
+            return f"{name}: cannot be listed ({self.error})"
+        lines = [
+            f"{name}: {self.file_count} files, {convert_size(self.total_bytes)}, "
+            f"{len(self.conflicts)} conflicts, about {self.estimated_seconds:.0f}s"
+        ]
+        for content_root, archive_name in zip(self.content_roots, self.archive_names):
+            status = (
+                " (already installed)" if archive_name in self.already_installed else ""
+            )
+            lines.append(f"  {archive_name}: {content_root or '.'}{status}")
+        if not self.content_roots and not self.nested_archives:
+            lines.append("  No content root found")
+        if self.nested_archives:
+            lines.append(
+                f"  {len(self.nested_archives)} nested archives are planned on install"
+            )
+        return "\n".join(lines)
+
+
+def find_existing_files(library_paths: list[str], workers: int = 16) -> set[str]:
+    """
+    Return the normalized library paths that already exist on disk.
+
+    Each target directory is listed once instead of checking every file.
+    """
+    library_path = get_library_path()
+    directories = {os.path.dirname(path) for path in library_paths}
+
+    def list_directory(directory: str) -> list[str]:
+        try:
+            with os.scandir(os.path.join(library_path, directory)) as entries:
+                return [
+                    os.path.normcase(os.path.join(directory, entry.name))
+                    for entry in entries
+                    if not entry.is_dir()
+                ]
+        except OSError:
+            return []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return {
+            path
+            for listing in executor.map(list_directory, directories)
+            for path in listing
+        }
+
+
+def plan_install(
+    archive_path: str,
+    throughput: float | None = None,
+    check_conflicts: bool = True,
+) -> InstallPlan:
+    """
+    Plan the installation of an archive from its listing.
+
+    Args:
+        archive_path (str): The archive to plan.
+        throughput (float | None): Bytes per second used for the time estimate,
+            the measured throughput of recent installations by default.
+        check_conflicts (bool): Look for library files that would be overwritten.
+    """
+    plan = InstallPlan(str(archive_path))
+    try:
+        members = archive_formats.list_archive(pathlib.Path(archive_path))
+    except extractor.ExtractionError as e:
+        plan.error = str(e)
+        return plan
+
+    member_sizes = dict(members)
+    # Later volumes of a multi-part archive are extracted with its first one
+    nested_archives, _ = archive_formats.group_volumes(
+        path for path, _ in members if is_file_archive(path)
+    )
+    plan.nested_archives = [str(path) for path in nested_archives]
+    content_roots = installer.find_listed_content_roots(list(member_sizes))
+    plan.content_roots = [str(content_root) for content_root in content_roots]
+    plan.archive_names = installer.get_content_root_names(
+        list(content_roots), pathlib.PureWindowsPath(), get_archive_name(archive_path)
+    )
+    bundle_names = get_archive_names(archive_path)
+    installed_names = content_database.get_existing_archive_names(
+        [*bundle_names, *plan.archive_names]
+    )
+    is_bundle_installed = not installed_names.isdisjoint(bundle_names)
+    for archive_name, files in zip(plan.archive_names, content_roots.values()):
+        if is_bundle_installed or archive_name in installed_names:
+            plan.already_installed.append(archive_name)
+            continue
+        for member_path, library_path in files:
+            plan.target_paths.append(library_path)
+            plan.total_bytes += member_sizes[member_path]
+
+    throughput = throughput or content_database.get_install_throughput()
+    plan.estimated_seconds = plan.total_bytes / (throughput or DEFAULT_THROUGHPUT)
+    if check_conflicts:
+        existing_files = find_existing_files(plan.target_paths)
+        plan.conflicts = [
+            path
+            for path in plan.target_paths
+            if os.path.normcase(path) in existing_files
+        ]
+    return plan
+
+
+def plan_installs(archive_paths: list[str], workers: int = 16) -> list[InstallPlan]:
+    """
+    Plan many archives in parallel.
+
+    Archives are listed concurrently, then the library directories targeted by
+    all plans are listed once to find the conflicts.
+    """
+    throughput = content_database.get_install_throughput()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        plans = list(
+            executor.map(
+                lambda archive_path: plan_install(archive_path, throughput, False),
+                archive_paths,
+            )
+        )
+
+    existing_files = find_existing_files(
+        [path for plan in plans for path in plan.target_paths], workers
+    )
+    for plan in plans:
+        plan.conflicts = [
+            path
+            for path in plan.target_paths
+            if os.path.normcase(path) in existing_files
+        ]
+    return plans
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    create_logger()
+    create_database_folder()
+    archive_paths = [
+        path for archives, _ in scan_archives(args.paths) for path, _ in archives
+    ]
+    plans = plan_installs(archive_paths, args.workers)
+    for plan in plans:
+        print(plan.describe())
+
+    installable = [plan for plan in plans if plan.is_installable]
+    print(
+        f"\n{len(installable)} of {len(plans)} archives can be installed: "
+        f"{sum(plan.file_count for plan in plans)} files, "
+        f"{convert_size(sum(plan.total_bytes for plan in plans))}, "
+        f"{sum(len(plan.conflicts) for plan in plans)} conflicts, "
+        f"about {sum(plan.estimated_seconds for plan in plans) / 60:.1f} minutes"
+    )
+
+
+if __name__ == "__main__":
+    main()
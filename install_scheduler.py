@@ -0,0 +1,233 @@
+import itertools
+import logging
+import os
+import threading
+from enum import Enum
+
+from helper.cancellation import CancellationToken
+from helper.config_operations import (
+    get_copy_workers,
+    get_extraction_workers,
+    get_scheduling_policy,
+)
+
+logger = logging.getLogger(__name__)
+
+# Installer phases with their own concurrency limit
+EXTRACT_PHASE = "extract"
+COPY_PHASE = "copy"
+
+
+class SchedulingPolicy(Enum):
+    FIFO = "fifo"
+    SHORTEST_FIRST = "shortest"
+    LARGEST_FIRST = "largest"
+
+
+class JobState(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    CANCELLED = "cancelled"
+    DONE = "done"
+
+
+class InstallJob:
+    """A queued installation of a single archive."""
+
+    def __init__(self, file_path: str, size: int, priority: int, sequence: int):
+        self.file_path = file_path
+        self.size = size
+        self.priority = priority
+        self.sequence = sequence
+        self.state = JobState.QUEUED
+        self.token = CancellationToken()
+        self.is_paused = False
+        # Whether a thread runs the job, queued jobs wait for take_next_job
+        self.is_started = False
+        # The phase the job waits for, jobs compete for a slot only in this phase
+        self.next_phase = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.state == JobState.CANCELLED
+
+
+class InstallScheduler:
+    """
+    Orders queued installs and limits how many run each phase at once.
+
+    Extraction is CPU heavy and copying is disk heavy, so both phases have
+    their own limit and one job can copy while another one extracts. When a
+    slot frees up it goes to the waiting job with the highest priority and,
+    among equal priorities, the one chosen by the scheduling policy.
+    """
+
+    def __init__(
+        self,
+        policy: SchedulingPolicy = SchedulingPolicy.FIFO,
+        extraction_workers: int = 1,
+        copy_workers: int = 1,
+    ):
+        self.policy = policy
+        self.limits = {EXTRACT_PHASE: extraction_workers, COPY_PHASE: copy_workers}
+        self.active = {EXTRACT_PHASE: 0, COPY_PHASE: 0}
+        self.jobs = []
+        self.condition = threading.Condition()
+        self.sequence = itertools.count()
+
+    def submit(
+        self,
+        file_path: str,
+        size: int | None = None,
+        priority: int = 0,
+        is_started: bool = False,
+    ) -> InstallJob:
+        """
+        Queues an archive for installation and returns its job.
+
+        Jobs that are started already are run by the caller, the others are
+        handed out by take_next_job.
+        """
+        if size is None:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
+        with self.condition:
+            job = InstallJob(file_path, size, priority, next(self.sequence))
+            job.is_started = is_started
+            self.jobs.append(job)
+            self.condition.notify_all()
+        return job
+
+    def _sort_key(self, job: InstallJob) -> tuple[int, int, int]:
+        if self.policy == SchedulingPolicy.SHORTEST_FIRST:
+            size_key = job.size
+        elif self.policy == SchedulingPolicy.LARGEST_FIRST:
+            size_key = -job.size
+        else:
+            size_key = 0
+        return -job.priority, size_key, job.sequence
+
+    def _is_next(self, job: InstallJob, phase: str) -> bool:
+        if self.active[phase] >= self.limits[phase]:
+            return False
+        candidates = [
+            queued
+            for queued in self.jobs
+            if queued.next_phase == phase
+            and not queued.is_paused
+            and not queued.is_cancelled
+        ]
+        return min(candidates, key=self._sort_key) is job
+
+    def take_next_job(self) -> InstallJob | None:
+        """
+        Hands the queued job that should run next to the calling thread.
+
+        Paused and cancelled jobs are skipped.
+
+        Returns:
+            InstallJob | None: The job, which is marked as started, or None if
+            no job is waiting for a thread.
+        """
+        with self.condition:
+            waiting = [
+                job
+                for job in self.jobs
+                if not job.is_started and not job.is_paused and not job.is_cancelled
+            ]
+            if not waiting:
+                return None
+            job = min(waiting, key=self._sort_key)
+            job.is_started = True
+            return job
+
+    def acquire(self, job: InstallJob, phase: str) -> bool:
+        """
+        Blocks until the job may enter the phase.
+
+        Returns:
+            bool: False if the job was cancelled while waiting.
+        """
+        with self.condition:
+            job.next_phase = phase
+            self.condition.notify_all()
+            while not job.is_cancelled and not (
+                not job.is_paused and self._is_next(job, phase)
+            ):
+                self.condition.wait()
+            if job.is_cancelled:
+                return False
+            job.next_phase = None
+            job.state = JobState.RUNNING
+            self.active[phase] += 1
+            return True
+
+    def release(self, phase: str) -> None:
+        """Frees the slot of a phase for the next job."""
+        with self.condition:
+            self.active[phase] -= 1
+            self.condition.notify_all()
+
+    def finish(self, job: InstallJob) -> None:
+        """Removes a job from the queue once it completed, failed or was cancelled."""
+        with self.condition:
+            if not job.is_cancelled:
+                job.state = JobState.DONE
+            job.next_phase = None
+            if job in self.jobs:
+                self.jobs.remove(job)
+            self.condition.notify_all()
+
+    def cancel(self, job: InstallJob) -> None:
+        """Cancels a job. A running job stops at its next cancellation check."""
+        with self.condition:
+            if job.state != JobState.DONE:
+                job.state = JobState.CANCELLED
+                job.token.cancel()
+                logger.info(f"Cancelled installation of {job.file_path}")
+            # No thread will finish a job that never started
+            if not job.is_started and job in self.jobs:
+                self.jobs.remove(job)
+            self.condition.notify_all()
+
+    def cancel_all(self) -> None:
+        """Cancels every queued and running job, used when the app closes."""
+        with self.condition:
+            for job in list(self.jobs):
+                self.cancel(job)
+
+    def pause(self, job: InstallJob) -> None:
+        """Holds a job back. A running job pauses before its next phase."""
+        with self.condition:
+            job.is_paused = True
+            self.condition.notify_all()
+
+    def resume(self, job: InstallJob) -> None:
+        with self.condition:
+            job.is_paused = False
+            self.condition.notify_all()
+
+    def set_priority(self, job: InstallJob, priority: int) -> None:
+        with self.condition:
+            job.priority = priority
+            self.condition.notify_all()
+
+    def set_policy(self, policy: SchedulingPolicy) -> None:
+        with self.condition:
+            self.policy = policy
+            self.condition.notify_all()
+
+
+def _get_configured_policy() -> SchedulingPolicy:
+    try:
+        return SchedulingPolicy(get_scheduling_policy())
+    except ValueError:
+        logger.warning(f"Unknown scheduling policy '{get_scheduling_policy()}'")
+        return SchedulingPolicy.FIFO
+
+
+scheduler = InstallScheduler(
+    _get_configured_policy(), get_extraction_workers(), get_copy_workers()
+)
@@ -1,21 +1,36 @@
+import itertools
+import logging
+import os
 import pathlib
-import patoolib
-import re
 import shutil
 import sqlite3
 import threading
 import time
-from helper.config_operations import get_library_path, get_debug_mode
-from helper.file_operations import create_temp_folder, delete_temp_folder, create_logger
-from patoolib.util import PatoolError
-from PySide6.QtCore import QMutex
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from helper import archive_formats
+from helper.cancellation import CancellationToken, InstallCancelled
+from helper.config_operations import (
+    get_copy_timeout,
+    get_debug_mode,
+    get_extraction_timeout,
+    get_library_path,
+)
+from helper.extractor import ExtractionError
+from helper.file_operations import (
+    get_archive_name,
+    get_archive_names,
+    list_relative_files,
+)
+from helper.io_governor import governor
+from helper.log_pipeline import job_id, submit_with_context
+from helper.process_pool import get_process_pool, shutdown_process_pool
+from install_scheduler import COPY_PHASE, EXTRACT_PHASE, InstallJob, scheduler
 import content_database
-import patches
+import extraction_cache
 
-install_mutex = QMutex()
-
-# Create a logger instance
-logger = create_logger()
+logger = logging.getLogger(__name__)
 # Path to the temporary extraction folder
 TEMP_FOLDER = pathlib.Path("temp")
 
@@ -38,57 +53,149 @@ TARGET_FOLDERS = [
     "Documentation",
 ]
 
-# Path to the 7z executable
-SEVEN_ZIP_PATH = str(pathlib.Path(__file__).parent.absolute() / "7z") + "\\7z.exe"
+# Limits for nested archive extraction
+NESTED_ARCHIVE_MAX_DEPTH = 5
+NESTED_ARCHIVE_WORKERS = 4
+# Number of content roots from one bundle that are installed at the same time
+CONTENT_ROOT_WORKERS = 4
+# Zip-bomb protection: total extracted bytes per install and expansion ratio per
+# archive. Large bundles stay well below the size, the free disk space of the
+# temporary folder lowers it further.
+MAX_EXTRACTED_SIZE = 64 * 1024**3
+MAX_COMPRESSION_RATIO = 200
+# Trees with fewer files and folders are listed in this process. Larger ones are
+# walked until they split into enough folders, at most to the given depth, and
+# those folders are listed in the process pool.
+MANIFEST_POOL_MIN_ENTRIES = 20000
+MANIFEST_CHUNKS = 16
+MANIFEST_SPLIT_DEPTH = 6
 
 # Create a threading lock
 lock = threading.Lock()
 
-archive_exists = False
-
 
-def get_relative_path(full_path: str) -> str:
+class ExtractionBudget:
     """
-    Get the relative path based on target folders.
-    If the path contains a target folder, return the sub-path starting
-    from the target folder.
+    The bytes an install may still extract, shared by its parallel extractions.
+
+    Archives reserve their declared size before they are extracted, so a
+    zip-bomb is rejected before it writes anything. The bytes and files that
+    are on disk after each extraction are counted as well, so later steps of
+    the install do not have to walk the extracted tree again.
     """
-    pattern = r"|".join([re.escape(folder) for folder in TARGET_FOLDERS])
-    match = re.search(pattern, full_path)
-    return full_path[match.start() :] if match else full_path
 
+    def __init__(self, limit: int):
+        self._lock = threading.Lock()
+        self.limit = limit
+        self.remaining = limit
+        self.is_exceeded = False
+        self.extracted_size = 0
+        self.extracted_files = 0
+
+    def reserve(self, size: int) -> bool:
+        with self._lock:
+            if size > self.remaining:
+                self.is_exceeded = True
+                return False
+            self.remaining -= size
+            return True
 
-def clean_temp_folder() -> None:
-    """
-    Clean the temporary folder by removing its contents.
-    """
-    if TEMP_FOLDER.exists():
-        shutil.rmtree(TEMP_FOLDER)
+    def add_extracted(self, size: int, file_count: int) -> None:
+        with self._lock:
+            self.extracted_size += size
+            self.extracted_files += file_count
+
+
+def get_extraction_budget() -> ExtractionBudget:
+    """Return the budget of one install, at most the free space of the temp folder."""
     TEMP_FOLDER.mkdir(parents=True, exist_ok=True)
+    return ExtractionBudget(
+        min(MAX_EXTRACTED_SIZE, shutil.disk_usage(TEMP_FOLDER).free)
+    )
 
 
-def extract_archive(item_path: pathlib.Path, is_debug_mode: bool) -> bool:
+def extract_within_budget(
+    file_path: pathlib.Path,
+    output_folder: pathlib.Path,
+    budget: ExtractionBudget,
+    token: CancellationToken,
+    is_debug_mode: bool,
+    members: list[tuple[str, int]] | None = None,
+) -> int | None:
     """
-    Extract an archive into the temporary folder.
+    Extract an archive if the size it declares fits the budget.
+
+    The declared size is read from the archive listing, which every backend
+    provides without extracting, unless the listing is passed in as members.
+    Archives that expand beyond the compression ratio limit or the remaining
+    budget are skipped. Declared sizes can be forged, so the extracted size is
+    charged to the budget as well.
+
+    Returns:
+        int | None: The number of bytes extracted, None if the archive was
+        skipped or could not be extracted.
     """
-    base_item_name = item_path.name
-    if base_item_name.lower().endswith((".zip", ".rar", ".7z", ".tar")):
-        logger.info(f"Extracting {base_item_name}")
+    volumes = archive_formats.find_volumes(file_path)
+    archive_size = max(sum(volume.stat().st_size for volume in volumes), 1)
+    if members is None:
         try:
-            verbosity = 2 if is_debug_mode else -1
-            patoolib.extract_archive(
-                str(item_path),
-                outdir=str(TEMP_FOLDER),
-                verbosity=verbosity,
-                interactive=False,
-                program=str(SEVEN_ZIP_PATH),
-            )
-            time.sleep(1)
-            return True
-        except PatoolError as e:
-            logger.error(f"Failed to extract archive {base_item_name}: {e}")
-            return False
-    return False
+            members = archive_formats.list_archive(file_path, token)
+        except ExtractionError as e:
+            logger.error(f"Failed to read archive {file_path.name}: {e}")
+            return None
+    declared_size = sum(size for _, size in members)
+    if declared_size / archive_size > MAX_COMPRESSION_RATIO:
+        logger.error(
+            f"Skipping archive {file_path.name}: declared size {declared_size} "
+            f"exceeds the compression ratio limit"
+        )
+        return None
+    if not budget.reserve(declared_size):
+        logger.error(
+            f"Skipping archive {file_path.name}: declared size {declared_size} "
+            f"exceeds the remaining extraction limit of {budget.remaining} bytes"
+        )
+        return None
+
+    logger.info(f"Extracting {file_path.name}")
+    try:
+        archive_formats.extract(file_path, output_folder, token, is_debug_mode)
+    except ExtractionError as e:
+        logger.error(f"Failed to extract archive {file_path.name}: {e}")
+        return None
+
+    extracted_size, extracted_files = get_folder_stats(output_folder)
+    if extracted_size > declared_size and not budget.reserve(
+        extracted_size - declared_size
+    ):
+        logger.error(
+            f"Archive {file_path.name} expanded to {extracted_size} bytes, "
+            f"more than it declared and the extraction limit allows"
+        )
+        shutil.rmtree(output_folder, ignore_errors=True)
+        return None
+    budget.add_extracted(extracted_size, extracted_files)
+    return extracted_size
+
+
+def extract_archive(
+    item_path: pathlib.Path,
+    output_folder: pathlib.Path,
+    budget: ExtractionBudget,
+    token: CancellationToken,
+    is_debug_mode: bool,
+    members: list[tuple[str, int]] | None = None,
+) -> bool:
+    """
+    Extract an archive into the temporary folder of its job.
+
+    The format is recognized from the content of the archive, so archives
+    with a missing or wrong extension are sent to the backend that reads them.
+    """
+    extracted_size = extract_within_budget(
+        item_path, output_folder, budget, token, is_debug_mode, members
+    )
+    return extracted_size is not None
 
 
 def clean_folder(folder_path: pathlib.Path) -> None:
@@ -100,147 +207,608 @@ def clean_folder(folder_path: pathlib.Path) -> None:
             item.unlink()
 
 
-def add_to_database(root_path: pathlib.Path, item: pathlib.Path) -> bool:
+def build_manifest(root_path: pathlib.Path) -> list[str]:
+    """
+    List every file below a content root, relative to the root.
+
+    The tree is walked here level by level. Once it has more entries than
+    MANIFEST_POOL_MIN_ENTRIES and has split into enough folders, the remaining
+    folders are walked in the shared process pool. Large installs use every
+    core and keep the GIL free for the GUI, and each folder comes back as its
+    own chunk instead of one large result. Trees below the threshold are
+    listed completely here, however deep they are, so small installs never
+    start the pool.
+    """
+    manifest = []
+    folders = [str(root_path)]
+    entry_count = 0
+    depth = 0
+    while folders:
+        if entry_count >= MANIFEST_POOL_MIN_ENTRIES and (
+            len(folders) >= MANIFEST_CHUNKS or depth >= MANIFEST_SPLIT_DEPTH
+        ):
+            break
+        subfolders = []
+        for folder in folders:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    entry_count += 1
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                    else:
+                        manifest.append(os.path.relpath(entry.path, root_path))
+        folders = subfolders
+        depth += 1
+    if not folders:
+        return manifest
+
+    root = itertools.repeat(str(root_path))
+    try:
+        chunks = list(get_process_pool().map(list_relative_files, folders, root))
+    except BrokenProcessPool:
+        logger.warning("Process pool stopped, listing files in this process")
+        shutdown_process_pool()
+        chunks = map(list_relative_files, folders, root)
+    for files in chunks:
+        manifest.extend(files)
+    return manifest
+
+
+def add_to_database(root_path: pathlib.Path, archive_name: str) -> int | None:
     """
     Add files to database after confirming unique name (already checked earlier)
+
+    Returns:
+        int | None: The number of files added, None if the archive exists.
     """
-    archive_name = item.stem.split(".")[0]
-    file_list = [
-        get_relative_path(str(file_path))
-        for file_path in root_path.rglob("*")
-        if file_path.is_file()
-    ]
+    file_list = build_manifest(root_path)
 
     try:
         logger.info(f"Adding archive '{archive_name}' with {len(file_list)} files.")
-        content_database.add_archive(archive_name, file_list)
-        time.sleep(1)
-        return False
+        with lock:
+            content_database.add_archive(archive_name, file_list)
+        return len(file_list)
     except sqlite3.IntegrityError:
         logger.warning(f"Archive '{archive_name}' already exists (race condition)")
-        return True
+        return None
 
 
-def handle_nested_archives(root_path, files, is_debug_mode):
+def find_nested_archives(folder_path: pathlib.Path) -> list[pathlib.Path]:
     """
-    Handle and extract nested archives within the main archive.
+    Collect every archive below folder_path in a single walk.
+
+    Archives are recognized by name, sniffing would read every texture in the
+    content. Multi-part archives are returned as their first volume.
     """
-    archive_extracted = False
-    for file in files:
-        file_path = root_path / file
-        if file.lower().endswith((".zip", ".rar", ".7z", ".tar")):
-            logger.info(f"Extracting nested archive: {file}")
-            try:
-                verbosity = 2 if is_debug_mode else -1
-                patoolib.extract_archive(
-                    str(file_path),
-                    outdir=str(root_path),
-                    verbosity=verbosity,
-                    interactive=False,
-                    program=str(SEVEN_ZIP_PATH),
+    archives, _ = archive_formats.group_volumes(
+        root / file
+        for root, _, files in folder_path.walk()
+        for file in files
+        if archive_formats.is_archive_name(file)
+    )
+    return list(archives)
+
+
+def get_folder_stats(folder_path: pathlib.Path) -> tuple[int, int]:
+    """
+    Return the combined size in bytes and the number of files below folder_path.
+    """
+    file_sizes = [
+        (root / file).stat().st_size
+        for root, _, files in folder_path.walk()
+        for file in files
+    ]
+    return sum(file_sizes), len(file_sizes)
+
+
+def get_nested_output_folder(
+    file_path: pathlib.Path, reserved: set[pathlib.Path]
+) -> pathlib.Path:
+    """
+    Return a fresh folder next to the nested archive to extract it into.
+    """
+    base_name = archive_formats.get_base_name(file_path.name)
+    output_folder = file_path.with_name(base_name)
+    index = 1
+    while output_folder.exists() or output_folder in reserved:
+        output_folder = file_path.with_name(f"{base_name}_{index}")
+        index += 1
+    reserved.add(output_folder)
+    return output_folder
+
+
+def extract_nested_archive(
+    file_path: pathlib.Path,
+    output_folder: pathlib.Path,
+    budget: ExtractionBudget,
+    token: CancellationToken,
+    is_debug_mode: bool,
+) -> pathlib.Path | None:
+    """
+    Extract a nested archive into its own subfolder and delete the archive.
+
+    Returns:
+        pathlib.Path | None: The output folder, None if the archive was skipped.
+    """
+    volumes = archive_formats.find_volumes(file_path)
+    extracted_size = extract_within_budget(
+        file_path, output_folder, budget, token, is_debug_mode
+    )
+    if extracted_size is None:
+        return None
+    # Delete the nested archive with all its volumes after extraction
+    volumes_size = sum(volume.stat().st_size for volume in volumes)
+    for volume in volumes:
+        volume.unlink()
+    budget.add_extracted(-volumes_size, -len(volumes))
+    return output_folder
+
+
+def handle_nested_archives(
+    folder_path: pathlib.Path,
+    budget: ExtractionBudget,
+    token: CancellationToken,
+    is_debug_mode: bool,
+) -> bool:
+    """
+    Extract all nested archives below folder_path.
+
+    Archives are processed level by level from a work queue. Each level is
+    extracted in parallel and only the freshly extracted subfolders are scanned
+    for further archives. Every archive reserves its size in the budget before
+    it is extracted.
+
+    Returns:
+        bool: False if the extraction limit was exceeded, True otherwise.
+    """
+    pending = [(file_path, 1) for file_path in find_nested_archives(folder_path)]
+
+    with ThreadPoolExecutor(max_workers=NESTED_ARCHIVE_WORKERS) as executor:
+        while pending:
+            token.raise_if_cancelled()
+            queue = []
+            reserved = set()
+            for file_path, depth in pending:
+                if depth > NESTED_ARCHIVE_MAX_DEPTH:
+                    logger.warning(
+                        f"Skipping nested archive {file_path.name}: "
+                        f"maximum depth of {NESTED_ARCHIVE_MAX_DEPTH} reached"
+                    )
+                    continue
+                output_folder = get_nested_output_folder(file_path, reserved)
+                future = submit_with_context(
+                    executor,
+                    extract_nested_archive,
+                    file_path,
+                    output_folder,
+                    budget,
+                    token,
+                    is_debug_mode,
+                )
+                queue.append((future, depth))
+
+            pending = []
+            for future, depth in queue:
+                output_folder = future.result()
+                if output_folder is None:
+                    continue
+                pending.extend(
+                    (file_path, depth + 1)
+                    for file_path in find_nested_archives(output_folder)
                 )
-                time.sleep(0.5)
-                file_path.unlink()  # Delete the nested archive after extraction
-                archive_extracted = True
-            except PatoolError as e:
-                logger.error(f"Failed to extract nested archive {file}: {e}")
-    return archive_extracted
 
+            if budget.is_exceeded:
+                logger.error(
+                    f"Extracted content exceeds the limit of {budget.limit} bytes"
+                )
+                return False
+    return True
+
+
+def find_content_roots(folder_path: pathlib.Path) -> list[pathlib.Path]:
+    """
+    Find every independent content root below folder_path in a single walk.
 
-def process_manifest_and_target_folders(root_path, dirs, files, current_item):
+    A content root is either the Content folder next to a manifest file or a
+    folder that directly contains one of the target folders. Content roots are
+    not searched any further, so each file belongs to exactly one root.
     """
-    Check for manifest files and target folders, and process them accordingly.
+    target_folders = {target.lower() for target in TARGET_FOLDERS}
+    content_roots = []
+    for root, dirs, files in folder_path.walk():
+        manifest_exists = any(file.lower().endswith("manifest.dsx") for file in files)
+        content_folders = [
+            folder for folder in dirs if folder.lower().startswith("content")
+        ]
+        if manifest_exists and content_folders:
+            content_roots.extend(root / folder for folder in content_folders)
+            dirs[:] = [folder for folder in dirs if folder not in content_folders]
+        elif any(folder.lower() in target_folders for folder in dirs):
+            content_roots.append(root)
+            dirs.clear()
+    return content_roots
+
+
+def get_content_root_names(
+    content_roots: list[pathlib.Path], folder_path: pathlib.Path, archive_name: str
+) -> list[str]:
     """
-    manifest_exists = any(file.lower().endswith("manifest.dsx") for file in files)
+    Name the database archive of each content root.
 
-    if manifest_exists or any(target in dirs for target in TARGET_FOLDERS):
-        for folder in dirs:
-            if manifest_exists and folder.lower().startswith("content"):
-                content_path = root_path / folder
-                clean_folder(content_path)
-                if add_to_database(content_path, current_item):
-                    return False
-                shutil.copytree(content_path, get_library_path(), dirs_exist_ok=True)
-                return True
+    A single root keeps the archive name. Roots of a bundle are named after the
+    folder they were found in, which is the name of the nested product archive.
+    """
+    if len(content_roots) == 1:
+        return [archive_name]
+
+    names = []
+    for content_root in content_roots:
+        product_folder = (
+            content_root.parent
+            if content_root.name.lower().startswith("content")
+            else content_root
+        )
+        if product_folder == folder_path:
+            name = archive_name
+        else:
+            name = f"{archive_name} - {product_folder.name}"
+        unique_name = name
+        index = 2
+        while unique_name in names:
+            unique_name = f"{name} ({index})"
+            index += 1
+        names.append(unique_name)
+    return names
+
+
+def find_listed_content_roots(
+    member_paths: list[str],
+) -> dict[pathlib.PureWindowsPath, list[tuple[str, str]]]:
+    """
+    Find the content roots of an archive from its listing without extracting it.
 
-            if any(target.lower() == folder.lower() for target in TARGET_FOLDERS):
-                clean_folder(root_path)
-                if add_to_database(root_path, current_item):
-                    return False
-                shutil.copytree(root_path, get_library_path(), dirs_exist_ok=True)
-                return True
-    return False
+    The same rules as in find_content_roots apply, and files directly inside a
+    content root are skipped just like clean_folder removes them on install.
 
+    Returns:
+        dict[pathlib.PureWindowsPath, list[tuple[str, str]]]: Each content root
+        with the member path and library path of every file it would install.
+    """
+    target_folders = {target.lower() for target in TARGET_FOLDERS}
+    # 7-Zip lists paths with backslashes, PureWindowsPath accepts both separators
+    paths = [pathlib.PureWindowsPath(member_path) for member_path in member_paths]
+    folders = {}
+    for path in paths:
+        folders.setdefault(path.parent, (set(), set()))[1].add(path.name)
+        for parent in path.parents[:-1]:
+            folders.setdefault(parent.parent, (set(), set()))[0].add(parent.name)
+
+    content_roots = []
+    pending = [pathlib.PureWindowsPath()]
+    while pending:
+        folder = pending.pop()
+        dirs, files = folders.get(folder, (set(), set()))
+        manifest_exists = any(file.lower().endswith("manifest.dsx") for file in files)
+        content_folders = {name for name in dirs if name.lower().startswith("content")}
+        if manifest_exists and content_folders:
+            content_roots.extend(folder / name for name in content_folders)
+            pending.extend(folder / name for name in dirs - content_folders)
+        elif any(name.lower() in target_folders for name in dirs):
+            content_roots.append(folder)
+        else:
+            pending.extend(folder / name for name in dirs)
+
+    root_files = {content_root: [] for content_root in sorted(content_roots)}
+    for member_path, path in zip(member_paths, paths):
+        for parent in path.parents[1:]:
+            if parent in root_files:
+                library_path = os.path.join(*path.relative_to(parent).parts)
+                root_files[parent].append((member_path, library_path))
+                break
+    return root_files
+
+
+def is_listing_installed(file_path: pathlib.Path, member_paths: list[str]) -> bool:
+    """
+    Check whether an archive is installed under its name or those of its roots.
 
-def traverse_directory(
+    Bundles are stored with one database archive per content root, so they are
+    recognized by the root names their listing yields. Content roots inside
+    nested archives only show up once these are extracted, so archives that
+    contain other archives are judged by their own names alone.
+    """
+    archive_names = get_archive_names(file_path)
+    if not any(map(archive_formats.is_archive_name, member_paths)):
+        content_roots = find_listed_content_roots(member_paths)
+        root_names = get_content_root_names(
+            list(content_roots), pathlib.PureWindowsPath(), get_archive_name(file_path)
+        )
+        installed_names = content_database.get_existing_archive_names(
+            [*archive_names, *root_names]
+        )
+        return not installed_names.isdisjoint(archive_names) or (
+            bool(root_names) and installed_names.issuperset(root_names)
+        )
+    return bool(content_database.get_existing_archive_names(archive_names))
+
+
+def install_content_root(
+    content_path: pathlib.Path, archive_name: str, token: CancellationToken
+) -> int | None:
+    """
+    Register a content root in the database and copy it into the library.
+
+    Files are copied within the limits of the active I/O profile. If the copy
+    is cancelled, the files it created are removed again together with the
+    database entry. Files that were already in the library may belong to other
+    products and are kept.
+
+    Returns:
+        int | None: The number of files installed, None if the content root
+        was installed already.
+    """
+    created_files = []
+
+    def copy_file(source: str, destination: str) -> None:
+        token.raise_if_cancelled()
+        is_new = not os.path.exists(destination)
+        if is_new:
+            # Recorded before copying so a partly written file is removed too
+            created_files.append(destination)
+        governor.copy_file(source, destination, token)
+
+    token.raise_if_cancelled()
+    clean_folder(content_path)
+    file_count = add_to_database(content_path, archive_name)
+    if file_count is None:
+        return None
+    try:
+        shutil.copytree(
+            content_path,
+            get_library_path(),
+            copy_function=copy_file,
+            dirs_exist_ok=True,
+        )
+    except InstallCancelled:
+        logger.warning(f"Removing partially installed archive '{archive_name}'")
+        for file_path in created_files:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Failed to remove {file_path}: {e}")
+        content_database.delete_archive(archive_name, delete_files=False)
+        raise
+    return file_count
+
+
+def install_content_roots(
+    content_roots: list[pathlib.Path],
+    archive_names: list[str],
+    token: CancellationToken,
+) -> tuple[bool, bool, int]:
+    """
+    Install each content root as its own database archive in parallel.
+
+    Returns:
+        tuple[bool, bool, int]: Whether any root was imported, whether all
+        roots were already installed and the number of files installed.
+    """
+    new_roots = []
+    for content_root, archive_name in zip(content_roots, archive_names):
+        if content_database.does_archive_exist(archive_name):
+            logger.warning(f"Asset already exists: {archive_name}")
+        else:
+            new_roots.append((content_root, archive_name))
+
+    if not new_roots:
+        return False, True, 0
+
+    with ThreadPoolExecutor(max_workers=CONTENT_ROOT_WORKERS) as executor:
+        futures = [
+            submit_with_context(executor, install_content_root, *root, token)
+            for root in new_roots
+        ]
+        file_counts = [
+            file_count
+            for future in futures
+            if (file_count := future.result()) is not None
+        ]
+    return bool(file_counts), False, sum(file_counts)
+
+
+def throttle_extraction(budget: ExtractionBudget, token: CancellationToken) -> None:
+    """
+    Wait until the extracted files fit the extraction limits of the I/O profile.
+
+    7-Zip cannot be slowed down while it writes, so the extracted bytes and
+    files are accounted for afterwards while the job still holds its
+    extraction slot. This keeps the average rate of a batch within the limit.
+    """
+    if governor.is_limited(EXTRACT_PHASE):
+        governor.throttle(
+            EXTRACT_PHASE, budget.extracted_size, budget.extracted_files, token
+        )
+
+
+def find_archive_content(
     folder_path: pathlib.Path,
     current_item: pathlib.Path,
+    budget: ExtractionBudget,
+    token: CancellationToken,
     is_debug_mode: bool,
-):
+) -> list[pathlib.Path]:
     """
-    Traverse the directory structure and handle nested archives and target folders.
+    Extract nested archives and return every content root found in the folder.
     """
-    for root, dirs, files in folder_path.walk():
-        root_path = pathlib.Path(root)
+    if not handle_nested_archives(folder_path, budget, token, is_debug_mode):
+        return []
 
-        if handle_nested_archives(root_path, files, is_debug_mode):
-            return traverse_directory(folder_path, current_item, is_debug_mode)
-        if process_manifest_and_target_folders(root_path, dirs, files, current_item):
-            return True
-        if archive_exists:
-            return False
-
-    return False
+    content_roots = find_content_roots(folder_path)
+    if len(content_roots) > 1:
+        logger.info(f"Found {len(content_roots)} content roots in {current_item.name}")
+    return content_roots
 
 
 def start_installer_gui(
-    file_path: str, progress_callback, is_delete_archive: bool = False
+    file_path: str,
+    progress_callback,
+    is_delete_archive: bool = False,
+    job: InstallJob | None = None,
+    dry_run: bool = False,
 ) -> tuple[bool, bool]:
-    is_archive_imported = False
+    """
+    Install an archive in two phases, extraction and copying into the library.
+
+    The scheduler decides when the job may enter each phase. Jobs that were not
+    queued beforehand are submitted with the default priority. Cancelling the
+    job or exceeding a phase timeout kills running extractions, and the
+    temporary folder of the job is always removed.
+
+    With dry_run the archive is only listed and the install plan is logged.
+
+    Returns:
+        tuple[bool, bool]: Whether the archive was (or would be) imported and
+        whether it was already installed.
+    """
+    if dry_run:
+        from install_planner import plan_install
+
+        plan = plan_install(file_path)
+        logger.info(plan.describe())
+        progress_callback(100)
+        return plan.is_installable, bool(plan.already_installed)
+
     file_path = pathlib.Path(file_path)
-    install_mutex.lock()
+    if job is None:
+        job = scheduler.submit(str(file_path), is_started=True)
+    token = job.token
+    job_folder = TEMP_FOLDER / uuid.uuid4().hex
+    cache_entry = None
+    log_context = job_id.set(f"job-{job.sequence}")
     try:
         logger.info(f"Installing {file_path}")
 
-        # Get archive name from file path
-        archive_name = file_path.stem.split(".")[0]  # Handle double extensions
+        archive_name = get_archive_name(file_path)
 
-        # Early check before any processing
-        if content_database.does_archive_exist(archive_name):
+        # Early check before any processing, also under the name up to the first
+        # dot that older versions stored archives under and the content root
+        # names of bundles. The listing is reused for the extraction.
+        try:
+            members = archive_formats.list_archive(file_path, token)
+        except ExtractionError as e:
+            logger.error(f"Failed to read archive {file_path.name}: {e}")
+            progress_callback(100)
+            return False, False
+        if is_listing_installed(file_path, [path for path, _ in members]):
             logger.warning(f"Asset already exists: {archive_name}")
             progress_callback(100)  # Immediate completion
             return False, True  # (not imported, already exists)
 
-        create_temp_folder()
-        clean_temp_folder()
-        progress_callback(10)
+        cache_key = None
+        if extraction_cache.get_max_size():
+            cache_key = extraction_cache.get_fingerprint(file_path)
+            cache_entry = extraction_cache.open_entry(cache_key)
+        busy_seconds = 0.0
+        if cache_entry is not None:
+            content_folder = cache_entry.folder / extraction_cache.FILES_FOLDER
+            content_roots = cache_entry.content_roots
+            extracted_size = cache_entry.size
+            progress_callback(40)
+        else:
+            if not scheduler.acquire(job, EXTRACT_PHASE):
+                return False, False
+            phase_start = time.perf_counter()
+            try:
+                with token.phase("extraction", get_extraction_timeout()):
+                    job_folder.mkdir(parents=True)
+                    progress_callback(10)
+                    budget = get_extraction_budget()
+                    if extract_archive(
+                        file_path, job_folder, budget, token, get_debug_mode(), members
+                    ):
+                        progress_callback(40)
+                        content_roots = find_archive_content(
+                            job_folder, file_path, budget, token, get_debug_mode()
+                        )
+                        throttle_extraction(budget, token)
+                    else:
+                        content_roots = []
+            finally:
+                scheduler.release(EXTRACT_PHASE)
+            busy_seconds = time.perf_counter() - phase_start
+            content_folder = job_folder
+            extracted_size = budget.extracted_size
+
+            if content_roots and cache_key is not None:
+                # Retries and reinstalls of the archive can skip the extraction
+                cache_entry = extraction_cache.store_entry(
+                    cache_key,
+                    file_path,
+                    job_folder,
+                    content_roots,
+                    extracted_size,
+                )
+                if cache_entry is not None:
+                    content_folder = cache_entry.folder / extraction_cache.FILES_FOLDER
+                    content_roots = cache_entry.content_roots
 
-        if not extract_archive(file_path, get_debug_mode()):
-            clean_temp_folder()
-            delete_temp_folder()
+        if not content_roots:
             progress_callback(100)
             return False, False
 
-        progress_callback(40)
+        archive_names = get_content_root_names(
+            content_roots, content_folder, archive_name
+        )
+        if not scheduler.acquire(job, COPY_PHASE):
+            return False, False
+        phase_start = time.perf_counter()
+        try:
+            with token.phase("copy", get_copy_timeout()):
+                is_archive_imported, is_archive_existing, file_count = (
+                    install_content_roots(content_roots, archive_names, token)
+                )
+        finally:
+            scheduler.release(COPY_PHASE)
+        busy_seconds += time.perf_counter() - phase_start
 
-        # Simplified processing since we already checked existence
-        traversal_success = traverse_directory(TEMP_FOLDER, file_path, get_debug_mode())
-        if traversal_success:
-            is_archive_imported = True
+        if is_archive_imported:
             logger.info(f"Successfully imported: {file_path}")
-
-        clean_temp_folder()
-        delete_temp_folder()
+            # Measured throughput for the install time estimate of dry runs
+            content_database.record_install(extracted_size, file_count, busy_seconds)
         progress_callback(90)
 
-        if is_delete_archive:
+        if is_delete_archive and not is_archive_existing:
             try:
-                file_path.unlink()
+                for volume in archive_formats.find_volumes(file_path):
+                    volume.unlink()
                 logger.info(f"Deleted archive: {file_path}")
             except Exception as e:
                 logger.error(f"Failed to delete archive {file_path}: {e}")
 
         progress_callback(100)
-        return is_archive_imported, False
+        return is_archive_imported, is_archive_existing
+    except InstallCancelled as e:
+        logger.warning(f"Stopped installing {file_path}: {e}")
+        return False, False
     finally:
-        install_mutex.unlock()
+        if cache_entry is not None:
+            extraction_cache.release_entry(cache_entry)
+        shutil.rmtree(job_folder, ignore_errors=True)
+        try:
+            TEMP_FOLDER.rmdir()  # Only succeeds once no other job is running
+        except OSError:
+            pass
+        scheduler.finish(job)
+        job_id.reset(log_context)
+
+
+def clean_stale_job_folders() -> None:
+    """
+    Remove temporary folders left behind by installations that did not finish,
+    including cache entries that were being stored or evicted.
+    """
+    if not scheduler.jobs:
+        shutil.rmtree(TEMP_FOLDER, ignore_errors=True)
+        extraction_cache.clean_evicted_entries()
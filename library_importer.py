@@ -0,0 +1,175 @@
+"""
+Imports archives that were installed before into the database.
+
+Usage:
+    python library_importer.py ARCHIVE_FOLDER [--workers 8] [--dry-run]
+"""
+
+import argparse
+import logging
+import os
+import pathlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import content_database
+import installer
+from helper import archive_formats, extractor
+from helper.config_operations import get_library_path
+from helper.file_operations import (
+    create_database_folder,
+    create_logger,
+    get_archive_name,
+    get_archive_names,
+    scan_archives,
+)
+from library_verifier import scan_library
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ImportReport:
+    imported: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    archives: int = 0
+    members: int = 0
+    matched_files: int = 0
+    elapsed: float = 0.0
+
+
+def plan_archive(
+    archive_path: str, library_files: set[str]
+) -> tuple[list[tuple[str, list[str]]], int]:
+    """
+    Work out which library files an archive owns from its listing.
+
+    Returns:
+        tuple[list[tuple[str, list[str]]], int]: The database archives with the
+        library files that belong to them and the number of listed files.
+    """
+    members = [
+        path for path, _ in archive_formats.list_archive(pathlib.Path(archive_path))
+    ]
+    content_roots = installer.find_listed_content_roots(members)
+    archive_names = installer.get_content_root_names(
+        list(content_roots), pathlib.PureWindowsPath(), get_archive_name(archive_path)
+    )
+    archives = []
+    for archive_name, files in zip(archive_names, content_roots.values()):
+        owned_files = [
+            file_name
+            for _, file_name in files
+            if os.path.normcase(file_name) in library_files
+        ]
+        if owned_files:
+            archives.append((archive_name, owned_files))
+    return archives, len(members)
+
+
+def import_archives(
+    archive_folder: str, workers: int = 8, dry_run: bool = False
+) -> ImportReport:
+    """
+    Rebuild the ownership of library files from a folder of original archives.
+
+    Archives are listed in parallel without extracting them. Their files are
+    matched against the files that exist in the library and every archive that
+    owns at least one file is loaded in one batched transaction.
+    """
+    start = time.perf_counter()
+    report = ImportReport()
+    archive_paths = [
+        path for archives, _ in scan_archives([archive_folder]) for path, _ in archives
+    ]
+    library_scan = scan_library(get_library_path(), {}, workers)
+    library_files = set(library_scan.files)
+
+    def plan(archive_path: str):
+        try:
+            return plan_archive(archive_path, library_files)
+        except extractor.ExtractionError as e:
+            logger.error(f"Failed to list archive {archive_path}: {e}")
+            return None, 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        plans = list(zip(archive_paths, executor.map(plan, archive_paths)))
+
+    # Bundles are stored per content root, so the names of the planned roots
+    # are checked along with the legacy names of the archives
+    legacy_names = {path: get_archive_names(path)[1:] for path in archive_paths}
+    existing_names = content_database.get_existing_archive_names(
+        [
+            *(
+                archive_name
+                for _, (archives, _) in plans
+                for archive_name, _ in archives or []
+            ),
+            *(name for names in legacy_names.values() for name in names),
+        ]
+    )
+
+    archives_to_add = []
+    for archive_path, (archives, member_count) in plans:
+        report.archives += 1
+        report.members += member_count
+        if archives is None:
+            report.failed.append(archive_path)
+            continue
+        new_archives = [
+            (archive_name, files)
+            for archive_name, files in archives
+            if archive_name not in existing_names
+        ]
+        if not new_archives or not existing_names.isdisjoint(
+            legacy_names[archive_path]
+        ):
+            report.skipped.append(archive_path)
+            continue
+        for archive_name, files in new_archives:
+            existing_names.add(archive_name)
+            report.imported.append(archive_name)
+            report.matched_files += len(files)
+        archives_to_add.extend(new_archives)
+
+    if archives_to_add and not dry_run:
+        content_database.add_archives(archives_to_add)
+
+    report.elapsed = time.perf_counter() - start
+    logger.info(
+        f"Imported {len(report.imported)} archives with {report.matched_files} files "
+        f"in {report.elapsed:.1f}s"
+    )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("archive_folder")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="report without writing to the database"
+    )
+    args = parser.parse_args()
+
+    create_logger()
+    create_database_folder()
+    report = import_archives(args.archive_folder, args.workers, args.dry_run)
+    elapsed = max(report.elapsed, 0.001)
+    print(
+        f"Listed {report.archives} archives with {report.members} files "
+        f"in {report.elapsed:.1f}s "
+        f"({report.archives / elapsed:.1f} archives/s, "
+        f"{report.members / elapsed:.0f} files/s)"
+    )
+    print(f"Imported: {len(report.imported)} ({report.matched_files} library files)")
+    print(f"Skipped (installed before or not in the library): {len(report.skipped)}")
+    print(f"Failed: {len(report.failed)}")
+    for archive_path in report.failed:
+        print(f"  {archive_path}")
+
+
+if __name__ == "__main__":
+    main()
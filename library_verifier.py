@@ -0,0 +1,248 @@
+"""
+Verifies that the library matches the file entries in the database.
+
+Usage:
+    python library_verifier.py [--full] [--reindex] [--workers 8] [--output report.txt]
+"""
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import content_database
+from helper.config_operations import get_library_path
+from helper.file_operations import create_database_folder, create_logger
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LibraryScan:
+    """Files and directories found below one top-level library folder."""
+
+    # Normalized relative path -> (relative path, size, mtime_ns)
+    files: dict[str, tuple[str, int, int]] = field(default_factory=dict)
+    # Relative directory path -> mtime_ns
+    directories: dict[str, int] = field(default_factory=dict)
+    # Normalized relative paths of directories that did not change since the last scan
+    unchanged_directories: set[str] = field(default_factory=set)
+
+
+@dataclass
+class VerificationReport:
+    missing: list[str] = field(default_factory=list)
+    orphaned: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    checked_files: int = 0
+    scanned_directories: int = 0
+    skipped_directories: int = 0
+    elapsed: float = 0.0
+
+
+def _scan_folder(
+    library_path: str, folder: str, known_directories: dict[str, int]
+) -> LibraryScan:
+    """
+    Scan one top-level folder of the library with os.scandir.
+
+    The files of a directory whose modification time matches the previous scan
+    are skipped. Its subdirectories are still visited because changes below
+    them do not update the modification time of the parent.
+    """
+    scan = LibraryScan()
+    pending = [folder]
+    while pending:
+        directory = pending.pop()
+        absolute_directory = os.path.join(library_path, directory)
+        try:
+            mtime_ns = os.stat(absolute_directory).st_mtime_ns
+            is_unchanged = known_directories.get(directory) == mtime_ns
+            scan.directories[directory] = mtime_ns
+            if is_unchanged:
+                scan.unchanged_directories.add(os.path.normcase(directory))
+            with os.scandir(absolute_directory) as entries:
+                for entry in entries:
+                    relative_path = os.path.join(directory, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(relative_path)
+                    elif not is_unchanged:
+                        stat = entry.stat(follow_symlinks=False)
+                        scan.files[os.path.normcase(relative_path)] = (
+                            relative_path,
+                            stat.st_size,
+                            stat.st_mtime_ns,
+                        )
+        except OSError as e:
+            logger.warning(f"Could not scan {absolute_directory}: {e}")
+    return scan
+
+
+def _stat_file(library_path: str, file_name: str) -> tuple[str, int, int] | None:
+    """Return the (relative path, size, mtime_ns) of a single library file."""
+    try:
+        stat = os.stat(os.path.join(library_path, file_name))
+    except OSError:
+        return None
+    return file_name, stat.st_size, stat.st_mtime_ns
+
+
+def scan_library(
+    library_path: str, known_directories: dict[str, int], workers: int
+) -> LibraryScan:
+    """Scan the library in parallel across its top-level folders."""
+    library_scan = LibraryScan()
+    folders = []
+    if not os.path.isdir(library_path):
+        logger.warning(f"Library folder {library_path} does not exist yet")
+        return library_scan
+    # Files directly in the library root are always checked
+    with os.scandir(library_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                folders.append(entry.name)
+            else:
+                stat = entry.stat(follow_symlinks=False)
+                library_scan.files[os.path.normcase(entry.name)] = (
+                    entry.name,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        scans = executor.map(
+            lambda folder: _scan_folder(library_path, folder, known_directories),
+            folders,
+        )
+        for scan in scans:
+            library_scan.files.update(scan.files)
+            library_scan.directories.update(scan.directories)
+            library_scan.unchanged_directories.update(scan.unchanged_directories)
+    return library_scan
+
+
+def verify_library(
+    full: bool = False, reindex: bool = False, workers: int = 8
+) -> VerificationReport:
+    """
+    Compare the library with the database and report missing, orphaned and
+    modified files.
+
+    The database entries are streamed once and matched against a hash map of
+    the scanned files, so no query is made per file. A file owned by several
+    archives matches each of their entries. Sizes and modification times are
+    recorded for files that have none yet, in unchanged directories those few
+    files are looked up individually. With reindex the current
+    state of modified files is accepted as well. Orphaned files are only found
+    in directories that changed since the last run unless full is set.
+
+    Args:
+        full (bool): Check every directory, not only those that changed since
+            the last run. This also detects files modified in place.
+        reindex (bool): Store the size and modification time of modified files.
+        workers (int): The number of top-level folders scanned in parallel.
+    """
+    start = time.perf_counter()
+    report = VerificationReport()
+    library_path = get_library_path()
+
+    with content_database.connect_database() as conn:
+        known_directories = {} if full else content_database.get_directory_states(conn)
+        library_scan = scan_library(library_path, known_directories, workers)
+        report.scanned_directories = len(library_scan.directories) - len(
+            library_scan.unchanged_directories
+        )
+        report.skipped_directories = len(library_scan.unchanged_directories)
+
+        stats_updates = []
+        matched_keys = set()
+        records = content_database.iter_file_records(conn)
+        for file_id, file_name, size, mtime_ns in records:
+            key = os.path.normcase(os.path.normpath(file_name))
+            scanned = library_scan.files.get(key)
+            is_unchanged = os.path.dirname(key) in library_scan.unchanged_directories
+            if scanned is None and is_unchanged:
+                if size is not None:
+                    # Seen before in a directory that did not change since
+                    continue
+                # Installed over an existing file since the last run, the
+                # directory did not change so it was not listed
+                scanned = _stat_file(library_path, file_name)
+            if scanned is None:
+                # Missing files have their stored stats cleared
+                report.missing.append(file_name)
+                if size is not None:
+                    stats_updates.append((None, None, file_id))
+                continue
+
+            matched_keys.add(key)
+
+            report.checked_files += 1
+            _, scanned_size, scanned_mtime_ns = scanned
+            if (size, mtime_ns) != (scanned_size, scanned_mtime_ns):
+                if size is not None:
+                    report.modified.append(file_name)
+                if size is None or reindex:
+                    stats_updates.append((scanned_size, scanned_mtime_ns, file_id))
+
+        report.orphaned = sorted(
+            relative_path
+            for key, (relative_path, _, _) in library_scan.files.items()
+            if key not in matched_keys
+        )
+        content_database.update_file_stats(conn, stats_updates)
+        content_database.set_directory_states(conn, library_scan.directories)
+
+    report.missing.sort()
+    report.modified.sort()
+    report.elapsed = time.perf_counter() - start
+    logger.info(
+        f"Verified library in {report.elapsed:.1f}s: {len(report.missing)} missing, "
+        f"{len(report.orphaned)} orphaned, {len(report.modified)} modified files"
+    )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--full", action="store_true", help="check every directory of the library"
+    )
+    parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="accept the current size and modification time of modified files",
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--output", help="write every reported path to this file")
+    args = parser.parse_args()
+
+    create_logger()
+    create_database_folder()
+    report = verify_library(args.full, args.reindex, args.workers)
+    sections = {
+        "Missing": report.missing,
+        "Orphaned": report.orphaned,
+        "Modified": report.modified,
+    }
+    print(
+        f"Checked {report.checked_files} files in {report.scanned_directories} "
+        f"directories ({report.skipped_directories} unchanged) "
+        f"in {report.elapsed:.1f}s"
+    )
+    for title, paths in sections.items():
+        print(f"{title}: {len(paths)}")
+        for path in paths[:10]:
+            print(f"  {path}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as report_file:
+            for title, paths in sections.items():
+                report_file.write(f"[{title}]\n")
+                report_file.writelines(f"{path}\n" for path in paths)
+
+
+if __name__ == "__main__":
+    main()
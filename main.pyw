@@ -1,13 +1,27 @@
 import sys
-from pathlib import Path
-from PySide6.QtGui import QIcon
-from PySide6.QtWidgets import QApplication
-from GUI.main_window import App
+import time
+
+startup_time = time.perf_counter()
+
+from multiprocessing import freeze_support
 
 if __name__ == "__main__":
+    # Worker processes of the process pool import this module as well, the
+    # GUI is only loaded in the main process
+    freeze_support()
+    from pathlib import Path
+    from PySide6.QtGui import QIcon
+    from PySide6.QtWidgets import QApplication
+    from GUI.main_window import App
+    from helper.file_operations import create_logger
+    from helper.process_pool import shutdown_process_pool
+
+    create_logger()
     icon_file = str(Path(__file__).parent.absolute() / "icons") + "\\gui_icon.ico"
     app = QApplication(sys.argv)
-    window = App()
+    window = App(startup_time)
     window.setWindowIcon(QIcon(icon_file))
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    exit_code = app.exec()
+    shutdown_process_pool()
+    sys.exit(exit_code)
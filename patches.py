@@ -1,8 +0,0 @@
-import patoolib.util
-
-
-def run_under_pythonw() -> bool:
-    return True
-
-
-patoolib.util.run_under_pythonw = run_under_pythonw